@@ -13,26 +13,37 @@ down_revision = "0002_cash_entries"
 branch_labels = None
 depends_on = None
 
+_CHECKS = (
+    ("ck_cash_entries_amount_positive", "amount > 0"),
+    ("ck_cash_entries_currency_code_allowed", "currency_code IN ('USD', 'RUB', 'UZS')"),
+    ("ck_cash_entries_flow_direction_allowed", "flow_direction IN ('INFLOW', 'OUTFLOW')"),
+)
+
 
 def upgrade() -> None:
-    op.create_check_constraint(
-        "ck_cash_entries_amount_positive",
-        "cash_entries",
-        "amount > 0",
-    )
-    op.create_check_constraint(
-        "ck_cash_entries_currency_code_allowed",
-        "cash_entries",
-        "currency_code IN ('USD', 'RUB', 'UZS')",
-    )
-    op.create_check_constraint(
-        "ck_cash_entries_flow_direction_allowed",
-        "cash_entries",
-        "flow_direction IN ('INFLOW', 'OUTFLOW')",
-    )
+    if op.get_bind().dialect.name == "postgresql":
+        # Template for constraint additions on populated tables: ADD ... NOT
+        # VALID takes only a brief lock, and VALIDATE runs under SHARE UPDATE
+        # EXCLUSIVE so concurrent writes keep flowing during the table scan.
+        for name, condition in _CHECKS:
+            op.execute(f"ALTER TABLE cash_entries ADD CONSTRAINT {name} CHECK ({condition}) NOT VALID")
+        with op.get_context().autocommit_block():
+            for name, _ in _CHECKS:
+                op.execute(f"ALTER TABLE cash_entries VALIDATE CONSTRAINT {name}")
+        return
+
+    # SQLite cannot ALTER constraints; batch mode rebuilds the table instead.
+    with op.batch_alter_table("cash_entries") as batch_op:
+        for name, condition in _CHECKS:
+            batch_op.create_check_constraint(name, condition)
 
 
 def downgrade() -> None:
-    op.drop_constraint("ck_cash_entries_flow_direction_allowed", "cash_entries", type_="check")
-    op.drop_constraint("ck_cash_entries_currency_code_allowed", "cash_entries", type_="check")
-    op.drop_constraint("ck_cash_entries_amount_positive", "cash_entries", type_="check")
+    if op.get_bind().dialect.name == "postgresql":
+        for name, _ in reversed(_CHECKS):
+            op.drop_constraint(name, "cash_entries", type_="check")
+        return
+
+    with op.batch_alter_table("cash_entries") as batch_op:
+        for name, _ in reversed(_CHECKS):
+            batch_op.drop_constraint(name, type_="check")
@@ -0,0 +1,60 @@
+"""Add covering index for latest-rate lookups on transactions.
+
+Revision ID: 0004_tx_pair_rate_index
+Revises: 46324ab7df9a
+Create Date: 2026-08-30 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_tx_pair_rate_index"
+down_revision = "46324ab7df9a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves `WHERE from_currency_id=? AND to_currency_id=? ORDER BY created_at
+    # DESC LIMIT 1` as an index-only scan; INCLUDE (rate) avoids the heap fetch.
+    # CONCURRENTLY keeps transactions writable during the build, which requires
+    # running outside the migration transaction.
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transactions_pair_created_desc "
+                "ON transactions (from_currency_id, to_currency_id, created_at DESC) INCLUDE (rate)"
+            )
+            # Both single-column indexes are prefix-covered by the composite above.
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_transactions_from_currency_id")
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_transactions_to_currency_id")
+        return
+
+    op.create_index(
+        "ix_transactions_pair_created_desc",
+        "transactions",
+        ["from_currency_id", "to_currency_id", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_transactions_from_currency_id"), table_name="transactions")
+    op.drop_index(op.f("ix_transactions_to_currency_id"), table_name="transactions")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transactions_to_currency_id "
+                "ON transactions (to_currency_id)"
+            )
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transactions_from_currency_id "
+                "ON transactions (from_currency_id)"
+            )
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_transactions_pair_created_desc")
+        return
+
+    op.create_index(op.f("ix_transactions_to_currency_id"), "transactions", ["to_currency_id"], unique=False)
+    op.create_index(op.f("ix_transactions_from_currency_id"), "transactions", ["from_currency_id"], unique=False)
+    op.drop_index("ix_transactions_pair_created_desc", table_name="transactions")
@@ -0,0 +1,49 @@
+"""Drop cash_entries indexes prefix-covered by composites.
+
+Revision ID: 0005_drop_dup_ce_indexes
+Revises: 0004_tx_pair_rate_index
+Create Date: 2026-08-30 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "0005_drop_dup_ce_indexes"
+down_revision = "0004_tx_pair_rate_index"
+branch_labels = None
+depends_on = None
+
+# Each of these is the leading column of an existing composite index
+# (currency_created, client_currency_created, created_by_created), so the
+# single-column copies only add write amplification on insert.
+_REDUNDANT_INDEXES = (
+    ("ix_cash_entries_currency_code", "currency_code"),
+    ("ix_cash_entries_client_name", "client_name"),
+    ("ix_cash_entries_created_by_telegram_id", "created_by_telegram_id"),
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # DROP/CREATE INDEX CONCURRENTLY keeps cash_entries writable but must
+        # run outside the migration transaction.
+        with op.get_context().autocommit_block():
+            for index_name, _ in _REDUNDANT_INDEXES:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+        return
+
+    for index_name, _ in _REDUNDANT_INDEXES:
+        op.drop_index(op.f(index_name), table_name="cash_entries")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for index_name, column in reversed(_REDUNDANT_INDEXES):
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON cash_entries ({column})"
+                )
+        return
+
+    for index_name, column in reversed(_REDUNDANT_INDEXES):
+        op.create_index(op.f(index_name), "cash_entries", [column], unique=False)
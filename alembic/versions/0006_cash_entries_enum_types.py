@@ -0,0 +1,91 @@
+"""Store cash_entries currency_code/flow_direction as native enums.
+
+Revision ID: 0006_cash_entries_enums
+Revises: 0005_drop_dup_ce_indexes
+Create Date: 2026-08-30 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_cash_entries_enums"
+down_revision = "0005_drop_dup_ce_indexes"
+branch_labels = None
+depends_on = None
+
+_CURRENCY_ENUM = sa.Enum("USD", "RUB", "UZS", "KGS", "EUR", name="currency_code_enum")
+_FLOW_ENUM = sa.Enum("INFLOW", "OUTFLOW", name="flow_direction_enum")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # Native enums are compared as small integers and shrink both the rows
+        # and the composite indexes; adding a currency later is ALTER TYPE ADD
+        # VALUE instead of a constraint rebuild.
+        op.execute("CREATE TYPE currency_code_enum AS ENUM ('USD', 'RUB', 'UZS', 'KGS', 'EUR')")
+        op.execute("CREATE TYPE flow_direction_enum AS ENUM ('INFLOW', 'OUTFLOW')")
+
+        op.alter_column(
+            "cash_entries",
+            "currency_code",
+            type_=_CURRENCY_ENUM,
+            postgresql_using="currency_code::currency_code_enum",
+        )
+        op.alter_column(
+            "cash_entries",
+            "flow_direction",
+            type_=_FLOW_ENUM,
+            postgresql_using="flow_direction::flow_direction_enum",
+        )
+
+        op.drop_constraint("ck_cash_entries_currency_code_allowed", "cash_entries", type_="check")
+        op.drop_constraint("ck_cash_entries_flow_direction_allowed", "cash_entries", type_="check")
+        return
+
+    # SQLite has no enum types; the Enum columns render as VARCHAR and the
+    # batch rebuild drops the now-redundant check constraints.
+    with op.batch_alter_table("cash_entries") as batch_op:
+        batch_op.drop_constraint("ck_cash_entries_currency_code_allowed", type_="check")
+        batch_op.drop_constraint("ck_cash_entries_flow_direction_allowed", type_="check")
+        batch_op.alter_column("currency_code", type_=sa.String(length=3))
+        batch_op.alter_column("flow_direction", type_=sa.String(length=8))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.alter_column(
+            "cash_entries",
+            "flow_direction",
+            type_=sa.String(length=8),
+            postgresql_using="flow_direction::varchar(8)",
+        )
+        op.alter_column(
+            "cash_entries",
+            "currency_code",
+            type_=sa.String(length=3),
+            postgresql_using="currency_code::varchar(3)",
+        )
+        op.execute("DROP TYPE flow_direction_enum")
+        op.execute("DROP TYPE currency_code_enum")
+        op.create_check_constraint(
+            "ck_cash_entries_currency_code_allowed",
+            "cash_entries",
+            "currency_code IN ('USD', 'RUB', 'UZS', 'KGS', 'EUR')",
+        )
+        op.create_check_constraint(
+            "ck_cash_entries_flow_direction_allowed",
+            "cash_entries",
+            "flow_direction IN ('INFLOW', 'OUTFLOW')",
+        )
+        return
+
+    with op.batch_alter_table("cash_entries") as batch_op:
+        batch_op.create_check_constraint(
+            "ck_cash_entries_currency_code_allowed",
+            "currency_code IN ('USD', 'RUB', 'UZS', 'KGS', 'EUR')",
+        )
+        batch_op.create_check_constraint(
+            "ck_cash_entries_flow_direction_allowed",
+            "flow_direction IN ('INFLOW', 'OUTFLOW')",
+        )
@@ -0,0 +1,43 @@
+"""Add covering index for chat-context reads on cash_entries.
+
+Revision ID: 0007_ce_context_index
+Revises: 0006_cash_entries_enums
+Create Date: 2026-08-30 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_ce_context_index"
+down_revision = "0006_cash_entries_enums"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Turns the last-N scan into a backward index walk and makes the
+    # balance/today-net sums index-only; amount is included for coverage.
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_cash_entries_created_currency_flow "
+                "ON cash_entries (created_at DESC, currency_code, flow_direction, amount)"
+            )
+        return
+
+    op.create_index(
+        "ix_cash_entries_created_currency_flow",
+        "cash_entries",
+        [sa.text("created_at DESC"), "currency_code", "flow_direction", "amount"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_cash_entries_created_currency_flow")
+        return
+
+    op.drop_index("ix_cash_entries_created_currency_flow", table_name="cash_entries")
@@ -0,0 +1,45 @@
+"""Add partial created_at index over non-deleted cash entries.
+
+Revision ID: 0008_ce_live_partial_index
+Revises: 0007_ce_context_index
+Create Date: 2026-08-30 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_ce_live_partial_index"
+down_revision = "0007_ce_context_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Every context/report read filters deleted_at IS NULL and most also
+    # order by created_at; the partial index keeps soft-deleted rows out of
+    # those scans entirely.
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_cash_entries_created_at_live "
+                "ON cash_entries (created_at DESC) WHERE deleted_at IS NULL"
+            )
+        return
+
+    op.create_index(
+        "ix_cash_entries_created_at_live",
+        "cash_entries",
+        [sa.text("created_at DESC")],
+        unique=False,
+        sqlite_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_cash_entries_created_at_live")
+        return
+
+    op.drop_index("ix_cash_entries_created_at_live", table_name="cash_entries")
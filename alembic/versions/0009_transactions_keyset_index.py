@@ -0,0 +1,51 @@
+"""Add keyset-pagination index on transactions and drop the prefix copy.
+
+Revision ID: 0009_tx_keyset_index
+Revises: 0008_ce_live_partial_index
+Create Date: 2026-08-30 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_tx_keyset_index"
+down_revision = "0008_ce_live_partial_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # History pagination walks (created_at, id) descending; the composite
+    # index serves that directly and prefix-covers the old single-column
+    # created_at index, which goes away.
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transactions_created_id_desc "
+                "ON transactions (created_at DESC, id DESC)"
+            )
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_transactions_created_at")
+        return
+
+    op.create_index(
+        "ix_transactions_created_id_desc",
+        "transactions",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.drop_index("ix_transactions_created_at", table_name="transactions")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transactions_created_at "
+                "ON transactions (created_at)"
+            )
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_transactions_created_id_desc")
+        return
+
+    op.create_index("ix_transactions_created_at", "transactions", ["created_at"], unique=False)
+    op.drop_index("ix_transactions_created_id_desc", table_name="transactions")
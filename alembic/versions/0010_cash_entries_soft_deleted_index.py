@@ -0,0 +1,45 @@
+"""Add partial index over soft-deleted cash entries.
+
+Revision ID: 0010_ce_soft_deleted_index
+Revises: 0009_tx_keyset_index
+Create Date: 2026-08-30 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010_ce_soft_deleted_index"
+down_revision = "0009_tx_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Counterpart of the live-rows index: the admin purge deletes
+    # WHERE deleted_at IS NOT NULL and the report version probe counts the
+    # same rows, so give them an index that skips live entries.
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_cash_entries_soft_deleted "
+                "ON cash_entries (deleted_at) WHERE deleted_at IS NOT NULL"
+            )
+        return
+
+    op.create_index(
+        "ix_cash_entries_soft_deleted",
+        "cash_entries",
+        ["deleted_at"],
+        unique=False,
+        sqlite_where=sa.text("deleted_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_cash_entries_soft_deleted")
+        return
+
+    op.drop_index("ix_cash_entries_soft_deleted", table_name="cash_entries")
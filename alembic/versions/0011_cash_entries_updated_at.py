@@ -0,0 +1,28 @@
+"""Add updated_at to cash_entries for the report/context version probes.
+
+Revision ID: 0011_ce_updated_at
+Revises: 0010_ce_soft_deleted_index
+Create Date: 2026-08-30 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011_ce_updated_at"
+down_revision = "0010_ce_soft_deleted_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable with no default: existing rows stay untouched and the ADD
+    # COLUMN is metadata-only on both PostgreSQL and SQLite.
+    op.add_column(
+        "cash_entries",
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("cash_entries", "updated_at")
@@ -15,20 +15,29 @@ branch_labels = None
 depends_on = None
 
 
-def upgrade() -> None:
-    # Drop old constraint and add new one with KGS and EUR
+def _replace_constraint(allowed: str) -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        # SQLite cannot ALTER constraints; batch mode rebuilds the table.
+        with op.batch_alter_table('cash_entries') as batch_op:
+            batch_op.drop_constraint('ck_cash_entries_currency_code_allowed', type_='check')
+            batch_op.create_check_constraint(
+                'ck_cash_entries_currency_code_allowed',
+                f"currency_code IN ({allowed})",
+            )
+        return
+
     op.drop_constraint('ck_cash_entries_currency_code_allowed', 'cash_entries', type_='check')
     op.create_check_constraint(
         'ck_cash_entries_currency_code_allowed',
         'cash_entries',
-        "currency_code IN ('USD', 'RUB', 'UZS', 'KGS', 'EUR')",
+        f"currency_code IN ({allowed})",
     )
 
 
+def upgrade() -> None:
+    # Drop old constraint and add new one with KGS and EUR
+    _replace_constraint("'USD', 'RUB', 'UZS', 'KGS', 'EUR'")
+
+
 def downgrade() -> None:
-    op.drop_constraint('ck_cash_entries_currency_code_allowed', 'cash_entries', type_='check')
-    op.create_check_constraint(
-        'ck_cash_entries_currency_code_allowed',
-        'cash_entries',
-        "currency_code IN ('USD', 'RUB', 'UZS')",
-    )
+    _replace_constraint("'USD', 'RUB', 'UZS'")
@@ -20,7 +20,12 @@ def upgrade() -> None:
     op.add_column('cash_entries', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
     op.create_index(op.f('ix_cash_entries_created_by_telegram_id'), 'cash_entries', ['created_by_telegram_id'], unique=False)
     op.create_index(op.f('ix_cash_entries_deleted_at'), 'cash_entries', ['deleted_at'], unique=False)
-    op.drop_constraint(op.f('uq_currencies_code'), 'currencies', type_='unique')
+    if op.get_bind().dialect.name == "sqlite":
+        # SQLite cannot ALTER constraints; batch mode rebuilds the table.
+        with op.batch_alter_table('currencies') as batch_op:
+            batch_op.drop_constraint(op.f('uq_currencies_code'), type_='unique')
+    else:
+        op.drop_constraint(op.f('uq_currencies_code'), 'currencies', type_='unique')
     op.drop_index(op.f('ix_currencies_code'), table_name='currencies')
     op.create_index(op.f('ix_currencies_code'), 'currencies', ['code'], unique=True)
     # ### end Alembic commands ###
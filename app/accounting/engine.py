@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-from decimal import Decimal
+import asyncio
+import time
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.api.errors import NotFoundError, ValidationError
 from app.database.models import Client, Currency, Transaction
@@ -16,6 +19,31 @@ from app.schemas.transaction import AIOperatorConfirmRequest, TransactionCreate
 from app.services.client_service import ClientService
 from app.validators.business import ensure_distinct_values, ensure_positive_decimal
 
+# Currency rows are effectively static reference data, so a short TTL is safe.
+_CURRENCY_CACHE_TTL_SECONDS = 300.0
+
+# Built once so every execution hash-matches the same compiled-statement cache
+# entry regardless of which codes are being resolved.
+_CURRENCIES_BY_CODES_STMT = select(Currency).where(Currency.code.in_(bindparam("codes", expanding=True)))
+_LATEST_RATE_STMT = (
+    select(Transaction.rate)
+    .where(
+        Transaction.from_currency_id == bindparam("from_currency_id"),
+        Transaction.to_currency_id == bindparam("to_currency_id"),
+    )
+    .order_by(Transaction.created_at.desc())
+    .limit(1)
+)
+
+# Scale of the Numeric(24, 8) amount columns.
+_Q8 = Decimal("0.00000001")
+
+
+def _quantize_amount(value: Decimal) -> Decimal:
+    """Round a computed amount to the column scale before it hits the wire."""
+
+    return value.quantize(_Q8, ROUND_HALF_UP)
+
 
 class AccountingEngine:
     """Create transactions and immutable ledger entries atomically."""
@@ -24,6 +52,7 @@ class AccountingEngine:
         self.base_currency_code = base_currency_code.upper()
         self.ledger_service = LedgerService()
         self.client_service = ClientService()
+        self._currency_cache: dict[str, tuple[Currency, float]] = {}
 
     async def create_manual_transaction(self, session: AsyncSession, payload: TransactionCreate) -> Transaction:
         """Create transaction from manual form input."""
@@ -38,7 +67,7 @@ class AccountingEngine:
             to_code=payload.to_currency_code,
         )
 
-        from_amount = payload.to_amount * payload.rate
+        from_amount = _quantize_amount(payload.to_amount * payload.rate)
         client = await self._resolve_client(session, None, payload.client_name)
 
         return await self._create_transaction_and_ledger(
@@ -68,66 +97,131 @@ class AccountingEngine:
             to_code=self.base_currency_code,
         )
 
-        client = None
-        if payload.client_name:
-            client = await self.client_service.get_or_create_by_name(session, payload.client_name)
-
         if payload.transaction_type == "BUY":
             # BUY means operator bought foreign currency and paid base currency.
-            effective_rate = payload.rate
-            if effective_rate is None:
-                effective_rate = await self._get_latest_rate(
-                    session=session,
-                    from_currency_id=base_currency.id,
-                    to_currency_id=foreign_currency.id,
-                )
+            rate_from_id, rate_to_id = base_currency.id, foreign_currency.id
+        else:
+            # SELL means operator sold foreign currency and received base currency.
+            rate_from_id, rate_to_id = foreign_currency.id, base_currency.id
+
+        client, effective_rate = await self._resolve_client_and_rate(
+            session=session,
+            client_name=payload.client_name,
+            rate=payload.rate,
+            rate_from_id=rate_from_id,
+            rate_to_id=rate_to_id,
+        )
 
+        if payload.transaction_type == "BUY":
             return await self._create_transaction_and_ledger(
                 session=session,
                 from_currency=base_currency,
                 to_currency=foreign_currency,
-                from_amount=payload.amount * effective_rate,
+                from_amount=_quantize_amount(payload.amount * effective_rate),
                 to_amount=payload.amount,
                 rate=effective_rate,
                 client=client,
             )
 
-        # SELL means operator sold foreign currency and received base currency.
-        effective_rate = payload.rate
-        if effective_rate is None:
-            effective_rate = await self._get_latest_rate(
-                session=session,
-                from_currency_id=foreign_currency.id,
-                to_currency_id=base_currency.id,
-            )
-
         return await self._create_transaction_and_ledger(
             session=session,
             from_currency=foreign_currency,
             to_currency=base_currency,
             from_amount=payload.amount,
-            to_amount=payload.amount * effective_rate,
+            to_amount=_quantize_amount(payload.amount * effective_rate),
             rate=effective_rate,
             client=client,
         )
 
+    async def _resolve_client_and_rate(
+        self,
+        session: AsyncSession,
+        *,
+        client_name: Optional[str],
+        rate: Optional[Decimal],
+        rate_from_id: int,
+        rate_to_id: int,
+    ) -> tuple[Optional[Client], Decimal]:
+        """Resolve client and effective rate, overlapping the lookups when possible.
+
+        The client upsert must stay on the caller's session, but the rate
+        lookup is read-only, so it can run concurrently on its own session.
+        """
+
+        if rate is not None or not client_name:
+            client = None
+            if client_name:
+                client = await self.client_service.get_or_create_by_name(session, client_name)
+            if rate is None:
+                rate = await self._get_latest_rate(
+                    session=session,
+                    from_currency_id=rate_from_id,
+                    to_currency_id=rate_to_id,
+                )
+            return client, rate
+
+        async with AsyncSession(session.bind) as rate_session:
+            # return_exceptions makes gather wait for both tasks to settle.
+            # A bare gather would propagate a rate failure while the client
+            # upsert is still mid-flight on the caller's session — the exact
+            # concurrent-use hazard described above — and the handler would
+            # then roll that session back underneath the orphaned task.
+            results = await asyncio.gather(
+                self.client_service.get_or_create_by_name(session, client_name),
+                self._get_latest_rate(
+                    session=rate_session,
+                    from_currency_id=rate_from_id,
+                    to_currency_id=rate_to_id,
+                ),
+                return_exceptions=True,
+            )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        client, rate = results
+        return client, rate
+
     async def _resolve_currencies(
         self,
         session: AsyncSession,
         from_code: str,
         to_code: str,
     ) -> tuple[Currency, Currency]:
-        """Load currency rows for given codes."""
+        """Load currency rows for given codes, caching them between transactions."""
 
         codes = [from_code.upper(), to_code.upper()]
-        result = await session.execute(select(Currency).where(Currency.code.in_(codes)))
-        currencies = {currency.code: currency for currency in result.scalars().all()}
-
-        if codes[0] not in currencies:
+        now = time.monotonic()
+
+        currencies: dict[str, Currency] = {}
+        missing: list[str] = []
+        for code in codes:
+            cached = self._currency_cache.get(code)
+            if cached is not None and now - cached[1] < _CURRENCY_CACHE_TTL_SECONDS:
+                # merge(load=False) re-attaches a per-session copy without a
+                # SELECT. The cached snapshot itself must never be handed out:
+                # the engine is process-shared, so relationship assignment
+                # would cascade one live instance into concurrent sessions.
+                currencies[code] = await session.merge(cached[0], load=False)
+            elif code not in missing:
+                missing.append(code)
+
+        if missing:
+            result = await session.execute(_CURRENCIES_BY_CODES_STMT, {"codes": missing})
+            for currency in result.scalars().all():
+                currencies[currency.code] = currency
+                # Cache a detached scalar-only snapshot, not the session-bound
+                # row, so nothing in the cache ever belongs to a live session.
+                snapshot = Currency(id=currency.id, code=currency.code, name=currency.name)
+                make_transient_to_detached(snapshot)
+                self._currency_cache[currency.code] = (snapshot, now)
+
+        from_currency = currencies.get(codes[0])
+        to_currency = currencies.get(codes[1])
+        if from_currency is None:
             raise NotFoundError(f"Currency not found: {codes[0]}")
-        if codes[1] not in currencies:
+        if to_currency is None:
             raise NotFoundError(f"Currency not found: {codes[1]}")
-        return currencies[codes[0]], currencies[codes[1]]
+        return from_currency, to_currency
 
     async def _resolve_client(
         self,
@@ -160,40 +254,31 @@ class AccountingEngine:
         rate: Decimal,
         client: Optional[Client],
     ) -> Transaction:
-        """Persist transaction and its immutable double-entry rows atomically."""
+        """Stage transaction and its immutable double-entry rows in the session.
+
+        The caller owns the commit boundary so the write can be composed into a
+        larger unit of work without forcing an extra fsync.
+        """
 
         transaction = Transaction(
-            from_currency_id=from_currency.id,
-            to_currency_id=to_currency.id,
             from_amount=from_amount,
             to_amount=to_amount,
             rate=rate,
-            client_id=client.id if client else None,
         )
-        session.add(transaction)
-        await session.flush()
-
-        await self.ledger_service.create_double_entries(
-            session=session,
-            transaction_id=transaction.id,
+        # Assign relationship objects directly so they are already loaded on the
+        # returned instance and no re-SELECT is needed after commit.
+        transaction.from_currency = from_currency
+        transaction.to_currency = to_currency
+        transaction.client = client
+        transaction.ledger_entries = self.ledger_service.build_double_entries(
             from_currency_id=from_currency.id,
             to_currency_id=to_currency.id,
             from_amount=from_amount,
             to_amount=to_amount,
         )
-
-        await session.commit()
-
-        result = await session.execute(
-            select(Transaction)
-            .options(
-                joinedload(Transaction.from_currency),
-                joinedload(Transaction.to_currency),
-                joinedload(Transaction.client),
-            )
-            .where(Transaction.id == transaction.id)
-        )
-        return result.scalar_one()
+        session.add(transaction)
+        await session.flush()
+        return transaction
 
     async def _get_latest_rate(
         self,
@@ -204,19 +289,23 @@ class AccountingEngine:
         """Fetch the rate used in the last transaction between these currencies."""
 
         # Try exact match direction first
-        query = (
-            select(Transaction.rate)
-            .where(
-                Transaction.from_currency_id == from_currency_id,
-                Transaction.to_currency_id == to_currency_id,
-            )
-            .order_by(Transaction.created_at.desc())
-            .limit(1)
+        rate = await session.scalar(
+            _LATEST_RATE_STMT,
+            {"from_currency_id": from_currency_id, "to_currency_id": to_currency_id},
         )
-        result = await session.execute(query)
-        rate = result.scalar_one_or_none()
 
         if rate is not None:
             return rate
 
         raise ValidationError("Rate is required for first-time transaction with this currency pair.")
+
+
+@lru_cache(maxsize=4)
+def get_shared_engine(base_currency_code: str) -> AccountingEngine:
+    """Return the process-wide engine for a base currency.
+
+    Keeping one long-lived instance per base currency preserves the currency
+    cache between requests instead of rebuilding it per DI scope.
+    """
+
+    return AccountingEngine(base_currency_code)
@@ -2,16 +2,33 @@
 
 from __future__ import annotations
 
-import json
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Optional
 
 import httpx
+import orjson
 from openai import AsyncOpenAI
 
 from app.api.errors import ValidationError
 
 
+@lru_cache(maxsize=16)
+def _shared_openai_client(
+    api_key: str,
+    base_url: Optional[str],
+    header_items: Optional[tuple[tuple[str, str], ...]],
+) -> AsyncOpenAI:
+    """Memoize AsyncOpenAI construction so equal configs share one HTTP pool."""
+
+    headers = dict(header_items) if header_items else None
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=httpx.Timeout(30.0, connect=5.0),
+    )
+    return AsyncOpenAI(api_key=api_key, base_url=base_url, default_headers=headers, http_client=http_client)
+
+
 class BaseAIClient(ABC):
     """Interface for AI backends used by parser service."""
 
@@ -20,9 +37,36 @@ class BaseAIClient(ABC):
         """Return parser result as JSON-compatible dict."""
 
 
+def _loads_json_object(raw_text: str) -> dict:
+    """Decode model output that is guaranteed to be a JSON object.
+
+    Used with backends running in native JSON mode, where fence stripping and
+    substring scanning are unnecessary.
+    """
+
+    try:
+        data = orjson.loads(raw_text)
+    except orjson.JSONDecodeError as exc:
+        raise ValidationError(f"Failed to decode AI JSON response: {exc}") from exc
+
+    if not isinstance(data, dict):
+        raise ValidationError("AI response JSON must be an object")
+    return data
+
+
 def _extract_json_object(raw_text: str) -> dict:
     """Extract first JSON object from model output."""
 
+    # Fast path: most models return plain JSON; only scan when decoding fails.
+    try:
+        data = orjson.loads(raw_text)
+    except orjson.JSONDecodeError:
+        pass
+    else:
+        if not isinstance(data, dict):
+            raise ValidationError("AI response JSON must be an object")
+        return data
+
     candidate = raw_text.strip()
     if candidate.startswith("```"):
         candidate = candidate.strip("`")
@@ -37,8 +81,8 @@ def _extract_json_object(raw_text: str) -> dict:
         candidate = candidate[start : end + 1]
 
     try:
-        data = json.loads(candidate)
-    except json.JSONDecodeError as exc:
+        data = orjson.loads(candidate)
+    except orjson.JSONDecodeError as exc:
         raise ValidationError(f"Failed to decode AI JSON response: {exc}") from exc
 
     if not isinstance(data, dict):
@@ -50,7 +94,8 @@ class OpenAIClient(BaseAIClient):
     """OpenAI-compatible adapter with strict parsing prompt."""
 
     def __init__(self, *, api_key: str, model: str, base_url: Optional[str] = None, extra_headers: Optional[dict] = None) -> None:
-        self._client = AsyncOpenAI(api_key=api_key, base_url=base_url, default_headers=extra_headers)
+        header_items = tuple(sorted(extra_headers.items())) if extra_headers else None
+        self._client = _shared_openai_client(api_key, base_url, header_items)
         self._model = model
 
     async def parse_to_json(self, *, prompt: str, text: str) -> dict:
@@ -59,6 +104,7 @@ class OpenAIClient(BaseAIClient):
         response = await self._client.chat.completions.create(
             model=self._model,
             temperature=0,
+            response_format={"type": "json_object"},
             messages=[
                 {"role": "system", "content": prompt},
                 {"role": "user", "content": text},
@@ -66,7 +112,7 @@ class OpenAIClient(BaseAIClient):
         )
 
         message_content = response.choices[0].message.content or ""
-        return _extract_json_object(message_content)
+        return _loads_json_object(message_content)
 
 
 class LocalLLMClient(BaseAIClient):
@@ -75,6 +121,15 @@ class LocalLLMClient(BaseAIClient):
     def __init__(self, *, base_url: str, model: str) -> None:
         self._base_url = base_url.rstrip("/")
         self._model = model
+        self._http = httpx.AsyncClient(
+            timeout=45,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+        )
+
+    async def aclose(self) -> None:
+        """Release pooled HTTP connections."""
+
+        await self._http.aclose()
 
     async def parse_to_json(self, *, prompt: str, text: str) -> dict:
         """Invoke local model endpoint and parse JSON payload."""
@@ -87,10 +142,9 @@ class LocalLLMClient(BaseAIClient):
                 {"role": "user", "content": text},
             ],
         }
-        async with httpx.AsyncClient(timeout=45) as client:
-            response = await client.post(f"{self._base_url}/chat/completions", json=payload)
-            response.raise_for_status()
-            body = response.json()
+        response = await self._http.post(f"{self._base_url}/chat/completions", json=payload)
+        response.raise_for_status()
+        body = response.json()
 
         try:
             content = body["choices"][0]["message"]["content"]
@@ -111,20 +165,21 @@ class OpenRouterClient(BaseAIClient):
             headers["HTTP-Referer"] = referer
         if title:
             headers["X-Title"] = title
-        self._client = AsyncOpenAI(api_key=api_key, base_url=base_url, default_headers=headers)
+        self._client = _shared_openai_client(api_key, base_url, tuple(sorted(headers.items())))
         self._model = model
 
     async def parse_to_json(self, *, prompt: str, text: str) -> dict:
         response = await self._client.chat.completions.create(
             model=self._model,
             temperature=0,
+            response_format={"type": "json_object"},
             messages=[
                 {"role": "system", "content": prompt},
                 {"role": "user", "content": text},
             ],
         )
         message_content = response.choices[0].message.content or ""
-        return _extract_json_object(message_content)
+        return _loads_json_object(message_content)
 
 
 class GoogleAIClient(BaseAIClient):
@@ -136,16 +191,28 @@ class GoogleAIClient(BaseAIClient):
         # API requires "models/" prefix or just the ID. Usually "gemini-pro" works in URL path if formatted correctly.
         # But safest is to use the model ID directly in URL.
         self._model = model
+        self._http = httpx.AsyncClient(
+            timeout=45,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+        )
+
+    async def aclose(self) -> None:
+        """Release pooled HTTP connections."""
+
+        await self._http.aclose()
 
     async def parse_to_json(self, *, prompt: str, text: str) -> dict:
         """Invoke Google Gemini API and parse JSON payload."""
 
         url = f"https://generativelanguage.googleapis.com/v1beta/models/{self._model}:generateContent"
         
-        # Construct payload for Gemini
+        # Send the static prompt and the user input as separate parts: no
+        # per-call concatenation, and the constant prefix stays cacheable by
+        # Gemini's context caching.
         payload = {
             "contents": [{
-                "parts": [{"text": f"{prompt}\n\nInput:\n{text}"}]
+                "role": "user",
+                "parts": [{"text": prompt}, {"text": text}]
             }],
             "generationConfig": {
                 "temperature": 0.0,
@@ -153,18 +220,17 @@ class GoogleAIClient(BaseAIClient):
             }
         }
 
-        async with httpx.AsyncClient(timeout=45) as client:
-            response = await client.post(
-                url, 
-                params={"key": self._api_key},
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            if response.status_code != 200:
-                raise ValidationError(f"Google AI Error ({response.status_code}): {response.text}")
-                
-            data = response.json()
+        response = await self._http.post(
+            url,
+            params={"key": self._api_key},
+            json=payload,
+            headers={"Content-Type": "application/json"}
+        )
+
+        if response.status_code != 200:
+            raise ValidationError(f"Google AI Error ({response.status_code}): {response.text}")
+
+        data = orjson.loads(response.content)
 
         try:
             # Extract text from response
@@ -173,4 +239,5 @@ class GoogleAIClient(BaseAIClient):
         except (KeyError, IndexError, TypeError) as exc:
             raise ValidationError(f"Unexpected Google AI response shape: {data}") from exc
 
-        return _extract_json_object(content)
+        # responseMimeType above already forces native JSON mode.
+        return _loads_json_object(content)
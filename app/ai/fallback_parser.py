@@ -3,33 +3,84 @@
 from __future__ import annotations
 
 import re
+import sys
 from decimal import Decimal
 from typing import Optional
 
 from app.api.errors import ValidationError
 
+# Canonical codes are interned so downstream comparisons and dict lookups on
+# parser output are pointer checks.
 CURRENCY_ALIASES: dict[str, str] = {
-    "USD": "USD",
-    "DOLLAR": "USD",
-    "USDT": "USD",
-    "RUB": "RUB",
-    "RUBL": "RUB",
-    "UZS": "UZS",
-    "SUM": "UZS",
-    "SOM": "UZS",
-    "SO'M": "UZS",
+    "USD": sys.intern("USD"),
+    "DOLLAR": sys.intern("USD"),
+    "USDT": sys.intern("USD"),
+    "RUB": sys.intern("RUB"),
+    "RUBL": sys.intern("RUB"),
+    "UZS": sys.intern("UZS"),
+    "SUM": sys.intern("UZS"),
+    "SOM": sys.intern("UZS"),
+    "SO'M": sys.intern("UZS"),
 }
 
 CURRENCY_PATTERN = re.compile(r"\b(?:usd|dollar|usdt|rub|rubl|uzs|sum|som|so'm)\b", re.IGNORECASE)
 NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)?")
 
+_OUTFLOW_TOKENS = (
+    "sotdim",
+    "sell",
+    "prodal",
+    "продал",
+    "otdal",
+    "berdim",
+    "chiqim",
+    "chiqdi",
+    "chiqdim",
+    "outflow",
+    "out flow",
+)
+_INFLOW_TOKENS = (
+    "berdi",
+    "oldim",
+    "oldi",
+    "sotib oldim",
+    "buy",
+    "kupil",
+    "купил",
+    "olдим",
+    "kirdi",
+    "kirim",
+    "keldi",
+    "inflow",
+    "in flow",
+)
+
+
+def _alternation(tokens: tuple[str, ...]) -> str:
+    """Join tokens into one escaped alternation, longest first."""
+
+    return "|".join(re.escape(token) for token in sorted(tokens, key=len, reverse=True))
+
+
+# Compiled once and combined: a single left-to-right traversal classifies
+# every flow verb, with the match group telling the direction. Deliberately
+# unanchored — the verbs carry agglutinative suffixes ("chiqimga",
+# "sotdimku"), so these are substring matches just like the original
+# two-pass scan.
+_FLOW_RE = re.compile(
+    rf"(?:(?P<out>{_alternation(_OUTFLOW_TOKENS)})|(?P<in>{_alternation(_INFLOW_TOKENS)}))"
+)
+
+_NOTE_RE = re.compile(r"(?<!\d)[,.:](?!\d)\s*(.+)", re.DOTALL)
+_CLIENT_SUFFIX_RE = re.compile(r"(?:ga|qa|ka)$", re.IGNORECASE)
+
 
 class RuleBasedAIParser:
     """Simple parser used when provider is unavailable."""
 
     def parse(self, text: str) -> dict:
         note: Optional[str] = None
-        note_match = re.search(r"(?<!\d)[,.:](?!\d)\s*(.+)", text, re.DOTALL)
+        note_match = _NOTE_RE.search(text)
         if note_match:
             note = note_match.group(1).strip()
             text = text[:note_match.start()]
@@ -55,39 +106,11 @@ class RuleBasedAIParser:
         }
 
     def _detect_flow(self, text: str) -> str:
-        outflow_tokens = [
-            "sotdim",
-            "sell",
-            "prodal",
-            "продал",
-            "otdal",
-            "berdim",
-            "chiqim",
-            "chiqdi",
-            "chiqdim",
-            "outflow",
-            "out flow",
-        ]
-        inflow_tokens = [
-            "berdi",
-            "oldim",
-            "oldi",
-            "sotib oldim",
-            "buy",
-            "kupil",
-            "купил",
-            "olдим",
-            "kirdi",
-            "kirim",
-            "keldi",
-            "inflow",
-            "in flow",
-        ]
-
-        if any(token in text for token in outflow_tokens):
-            return "OUTFLOW"
-        if any(token in text for token in inflow_tokens):
-            return "INFLOW"
+        # One scan for both directions; any outflow verb wins over inflow
+        # verbs regardless of position, matching the old two-pass priority.
+        for match in _FLOW_RE.finditer(text):
+            if match.lastgroup == "out":
+                return "OUTFLOW"
         return "INFLOW"
 
     def _extract_currency(self, text: str) -> str:
@@ -109,7 +132,7 @@ class RuleBasedAIParser:
         first_token = text.split(" ", 1)[0] if text else ""
         if not first_token or NUMBER_PATTERN.fullmatch(first_token.replace(",", ".")):
             return None
-        token = re.sub(r"(ga|qa|ka)$", "", first_token, flags=re.IGNORECASE)
+        token = _CLIENT_SUFFIX_RE.sub("", first_token)
         token = token.strip(" ,.;:-")
         return token or None
 
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import logging
+from typing import Callable, Optional
 
 from app.ai.ai_client import BaseAIClient, GoogleAIClient, LocalLLMClient, OpenAIClient, OpenRouterClient
 from app.ai.fallback_parser import RuleBasedAIParser
@@ -12,6 +13,68 @@ from app.api.errors import ValidationError
 from app.config import Settings
 from app.schemas.ai import AIParsedEntry
 
+logger = logging.getLogger(__name__)
+
+
+def _build_openai(settings: Settings) -> Optional[BaseAIClient]:
+    if not settings.openai_api_key:
+        return None
+    return OpenAIClient(api_key=settings.openai_api_key, model=settings.openai_model)
+
+
+def _build_google(settings: Settings) -> Optional[BaseAIClient]:
+    if not settings.openai_api_key:
+        return None
+    return GoogleAIClient(api_key=settings.openai_api_key, model=settings.openai_model)
+
+
+def _build_groq(settings: Settings) -> Optional[BaseAIClient]:
+    if not settings.groq_api_key:
+        return None
+    return OpenAIClient(
+        api_key=settings.groq_api_key,
+        model=settings.groq_model,
+        base_url="https://api.groq.com/openai/v1",
+    )
+
+
+def _build_openrouter(settings: Settings) -> Optional[BaseAIClient]:
+    if not settings.openrouter_api_key:
+        return None
+    return OpenRouterClient(
+        api_key=settings.openrouter_api_key,
+        model=settings.openrouter_model,
+        base_url=settings.openrouter_base_url,
+        referer=settings.openrouter_referer,
+        title=settings.openrouter_title,
+    )
+
+
+def _build_deepseek(settings: Settings) -> Optional[BaseAIClient]:
+    if not settings.deepseek_api_key:
+        return None
+    return OpenAIClient(
+        api_key=settings.deepseek_api_key,
+        model=settings.deepseek_model,
+        base_url=settings.deepseek_base_url,
+    )
+
+
+def _build_local(settings: Settings) -> Optional[BaseAIClient]:
+    return LocalLLMClient(base_url=settings.local_llm_base_url, model=settings.local_llm_model)
+
+
+# Provider name -> client builder; adding a backend is one entry here instead
+# of another elif in the factory.
+_PROVIDER_BUILDERS: dict[str, Callable[[Settings], Optional[BaseAIClient]]] = {
+    "openai": _build_openai,
+    "google": _build_google,
+    "groq": _build_groq,
+    "openrouter": _build_openrouter,
+    "deepseek": _build_deepseek,
+    "local": _build_local,
+}
+
 
 class AIParserService:
     """Parse and validate operator natural-language entry messages."""
@@ -25,35 +88,8 @@ class AIParserService:
     def from_settings(cls, settings: Settings) -> "AIParserService":
         """Factory selecting configured AI backend."""
 
-        client: Optional[BaseAIClient] = None
-
-        if settings.ai_provider == "openai" and settings.openai_api_key:
-            client = OpenAIClient(api_key=settings.openai_api_key, model=settings.openai_model)
-        elif settings.ai_provider == "google" and settings.openai_api_key:
-            client = GoogleAIClient(api_key=settings.openai_api_key, model=settings.openai_model)
-        elif settings.ai_provider == "groq" and settings.groq_api_key:
-            client = OpenAIClient(
-                api_key=settings.groq_api_key,
-                model=settings.groq_model,
-                base_url="https://api.groq.com/openai/v1",
-            )
-        elif settings.ai_provider == "openrouter" and settings.openrouter_api_key:
-            client = OpenRouterClient(
-                api_key=settings.openrouter_api_key,
-                model=settings.openrouter_model,
-                base_url=settings.openrouter_base_url,
-                referer=settings.openrouter_referer,
-                title=settings.openrouter_title,
-            )
-        elif settings.ai_provider == "deepseek" and settings.deepseek_api_key:
-            client = OpenAIClient(
-                api_key=settings.deepseek_api_key,
-                model=settings.deepseek_model,
-                base_url=settings.deepseek_base_url,
-            )
-        elif settings.ai_provider == "local":
-            client = LocalLLMClient(base_url=settings.local_llm_base_url, model=settings.local_llm_model)
-
+        builder = _PROVIDER_BUILDERS.get(settings.ai_provider)
+        client = builder(settings) if builder is not None else None
         return cls(client)
 
     async def parse(self, text: str) -> AIParsedEntry:
@@ -69,7 +105,9 @@ class AIParserService:
                 raw_payload = await self._client.parse_to_json(prompt=prompt, text=text)
                 return self._validator.validate(raw_payload)
             except Exception as exc:  # noqa: BLE001
-                print(f"AI Provider failed: {exc}")
+                # %s-style is lazy (no formatting when the level is filtered)
+                # and logging avoids a blocking stdout write under the loop.
+                logger.warning("AI Provider failed: %s", exc)
 
         fallback_payload = self._fallback_parser.parse(text)
         return self._validator.validate(fallback_payload)
@@ -2,21 +2,44 @@
 
 from __future__ import annotations
 
+import sys
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from types import MappingProxyType
 
 from app.api.errors import ValidationError
 from app.schemas.ai import AIParsedEntry
 
 
-CURRENCY_ALIASES = {
-    "DOLLAR": "USD",
-    "USDT": "USD",
-    "SOM": "UZS",
-    "SUM": "UZS",
-    "RUBL": "RUB",
-    "РУБ": "RUB",
-    "SO'M": "UZS",
-}
+# Read-only view; canonical codes are interned so downstream equality checks
+# are pointer comparisons.
+CURRENCY_ALIASES = MappingProxyType({
+    "DOLLAR": sys.intern("USD"),
+    "USDT": sys.intern("USD"),
+    "SOM": sys.intern("UZS"),
+    "SUM": sys.intern("UZS"),
+    "RUBL": sys.intern("RUB"),
+    "РУБ": sys.intern("RUB"),
+    "SO'M": sys.intern("UZS"),
+})
+
+
+# Pre-bound compiled validator: skips the model_validate classmethod wrapper
+# and its attribute lookups on every parse.
+_validate_parsed_entry = AIParsedEntry.__pydantic_validator__.validate_python
+
+
+@lru_cache(maxsize=64)
+def _canonicalize_currency(raw: str) -> str:
+    """Normalize a raw currency token to its canonical code.
+
+    Input cardinality is tiny (a handful of aliases plus the codes
+    themselves), so the cache saturates immediately and repeat validations
+    skip the upper/strip string work.
+    """
+
+    code = raw.upper().strip()
+    return CURRENCY_ALIASES.get(code, code)
 
 
 class AIParseValidator:
@@ -28,8 +51,7 @@ class AIParseValidator:
         if not isinstance(payload, dict):
             raise ValidationError("AI parser output must be a JSON object")
 
-        currency_code = str(payload.get("currency_code", "")).upper().strip()
-        currency_code = CURRENCY_ALIASES.get(currency_code, currency_code)
+        currency_code = _canonicalize_currency(str(payload.get("currency_code", "")))
 
         try:
             amount = Decimal(str(payload.get("amount")))
@@ -45,7 +67,7 @@ class AIParseValidator:
         }
 
         try:
-            parsed = AIParsedEntry.model_validate(model_payload)
+            parsed = _validate_parsed_entry(model_payload)
         except Exception as exc:  # noqa: BLE001
             raise ValidationError(f"Invalid AI parsed data: {exc}") from exc
 
@@ -1,12 +1,17 @@
 """Dependency helpers for API layer."""
 
+from functools import lru_cache
+
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.accounting.engine import AccountingEngine, get_shared_engine
 from app.ai.parser import AIParserService
 from app.config import Settings, get_settings
 from app.database.session import db_manager, get_db_session
 from app.services.backup_service import BackupScheduler
+from app.services.balance_service import BalanceService
+from app.services.client_service import ClientService
 from app.services.entry_service import EntryService
 
 
@@ -28,7 +33,32 @@ def get_backup_scheduler(settings: Settings = Depends(get_settings)) -> BackupSc
     return BackupScheduler(db_manager.session_factory, settings)
 
 
-def get_ai_parser(settings: Settings = Depends(get_settings)) -> AIParserService:
-    """Build AI parser service dependency."""
+@lru_cache(maxsize=1)
+def _shared_ai_parser() -> AIParserService:
+    """Build the AI parser once; settings are a cached singleton."""
+
+    return AIParserService.from_settings(get_settings())
+
+
+def get_ai_parser() -> AIParserService:
+    """Return the shared AI parser service dependency."""
+
+    return _shared_ai_parser()
+
+
+def get_balance_service() -> BalanceService:
+    """Build balance service dependency."""
+
+    return BalanceService()
+
+
+def get_client_service() -> ClientService:
+    """Build client service dependency."""
+
+    return ClientService()
+
+
+def get_accounting_engine(settings: Settings = Depends(get_settings)) -> AccountingEngine:
+    """Return the shared accounting engine dependency."""
 
-    return AIParserService.from_settings(settings)
+    return get_shared_engine(settings.base_currency_code)
@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+import csv
+import io
 from datetime import date
+from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database.models import CashEntry
+
 from app.api.deps import get_backup_scheduler, get_entry_service, get_session
+from app.database.session import db_manager
 from app.schemas.report import (
     CashTotalReport,
     ClientDebtItem,
@@ -21,53 +29,148 @@ from app.services.entry_service import EntryService
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
+# Same cheap version probe the chat-context cache uses: inserts move MAX(id),
+# soft deletes move the count of non-null deleted_at, and in-place edits,
+# restores, and soft deletes stamp updated_at, so MAX(updated_at) moves too.
+_VERSION_STMT = select(
+    func.max(CashEntry.id),
+    func.count(CashEntry.deleted_at),
+    func.max(CashEntry.updated_at),
+)
+
+
+async def _check_etag(request: Request, response: Response, session: AsyncSession) -> Optional[Response]:
+    """Set a weak ETag from the entries version; return a 304 when it matches.
+
+    The token is global, so any mutation invalidates every report — reports
+    over-revalidate rather than ever serving stale data.
+    """
+
+    max_id, deleted, updated = (await session.execute(_VERSION_STMT)).one()
+    etag = f'W/"{max_id or 0}-{deleted}-{updated.timestamp() if updated is not None else 0}"'
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return None
+
 
 @router.get("/daily-profit", response_model=DailyProfitReport)
 async def daily_profit_report(
+    request: Request,
+    response: Response,
     target_date: date = Query(default_factory=date.today, alias="date"),
     session: AsyncSession = Depends(get_session),
     service: EntryService = Depends(get_entry_service),
 ) -> DailyProfitReport:
     """Return per-currency daily net flow."""
 
+    if (not_modified := await _check_etag(request, response, session)) is not None:
+        return not_modified
     data = await service.daily_profit_by_currency(session, target_date)
     return DailyProfitReport(date=target_date, by_currency=data)
 
 
 @router.get("/currency-balances", response_model=CurrencyBalancesReport)
 async def currency_balances_report(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     service: EntryService = Depends(get_entry_service),
 ) -> CurrencyBalancesReport:
     """Return all-time balances by currency."""
 
+    if (not_modified := await _check_etag(request, response, session)) is not None:
+        return not_modified
     data = await service.currency_balances(session)
     return CurrencyBalancesReport(by_currency=data)
 
 
 @router.get("/client-debts", response_model=ClientDebtReport)
 async def client_debts_report(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     service: EntryService = Depends(get_entry_service),
 ) -> ClientDebtReport:
     """Return client debt list by currency."""
 
+    if (not_modified := await _check_etag(request, response, session)) is not None:
+        return not_modified
     rows = await service.client_debts(session)
-    items = [ClientDebtItem(client_name=client, currency_code=currency, debt_amount=debt) for client, currency, debt, _ in rows]
+    # model_construct skips validation; the rows come straight from typed
+    # DB columns that the schema constraints already guarantee.
+    items = [
+        ClientDebtItem.model_construct(client_name=client, currency_code=currency, debt_amount=debt)
+        for client, currency, debt, _ in rows
+    ]
     return ClientDebtReport(items=items)
 
 
 @router.get("/cash-total", response_model=CashTotalReport)
 async def cash_total_report(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     service: EntryService = Depends(get_entry_service),
 ) -> CashTotalReport:
     """Return cash total by currency and explicit UZS total."""
 
+    if (not_modified := await _check_etag(request, response, session)) is not None:
+        return not_modified
     by_currency, uzs_total = await service.cash_total(session)
     return CashTotalReport(by_currency=by_currency, uzs_total=uzs_total)
 
 
+@router.get("/entries-csv")
+async def stream_entries_csv(
+    target_date: date = Query(default_factory=date.today, alias="date"),
+    service: EntryService = Depends(get_entry_service),
+) -> StreamingResponse:
+    """Stream one day's entries as CSV straight from a server-side cursor.
+
+    Unlike /export-daily-csv this never materializes the day in memory or
+    touches the filesystem, so first byte and footprint are independent of
+    how many entries the day holds.
+    """
+
+    async def generate() -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(
+            ["id", "amount", "currency_code", "flow_direction", "client_name", "note", "created_at", "created_by_telegram_id"]
+        )
+        # The session must outlive the endpoint call, so it is opened inside
+        # the generator rather than taken from the request-scoped dependency.
+        async with db_manager.session_factory() as session:
+            rows = await service.stream_entries_for_day(session, target_date)
+            async for row in rows:
+                writer.writerow(
+                    [
+                        row.id,
+                        str(row.amount),
+                        row.currency_code,
+                        row.flow_direction,
+                        row.client_name,
+                        row.note or "",
+                        row.created_at.isoformat() if row.created_at else "",
+                        row.created_by_telegram_id,
+                    ]
+                )
+                if buffer.tell() >= 64_000:
+                    yield buffer.getvalue().encode("utf-8")
+                    buffer.seek(0)
+                    buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+
+    filename = f"entries_{target_date.isoformat()}.csv"
+    return StreamingResponse(
+        generate(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.post("/export-daily-csv", response_model=ExportDailyCSVResponse)
 async def export_daily_csv(
     target_date: date = Query(default_factory=date.today, alias="date"),
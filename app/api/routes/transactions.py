@@ -1,13 +1,20 @@
 """Transaction endpoints."""
 
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func, select
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import raiseload, selectinload
 
 from app.accounting.engine import AccountingEngine
 from app.api.deps import get_accounting_engine, get_session
+from app.api.errors import ValidationError
 from app.database.models import Transaction
+from app.schemas.client import ClientRead
 from app.schemas.transaction import (
     AIOperatorConfirmRequest,
     TransactionCreate,
@@ -18,6 +25,28 @@ from app.schemas.transaction import (
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
 
+def _from_orm(tx: Transaction) -> TransactionRead:
+    """Build the read model without re-validating what the DB already enforces."""
+
+    client = tx.client
+    return TransactionRead.model_construct(
+        id=tx.id,
+        from_currency_code=tx.from_currency.code,
+        to_currency_code=tx.to_currency.code,
+        from_amount=tx.from_amount,
+        to_amount=tx.to_amount,
+        rate=tx.rate,
+        created_at=tx.created_at,
+        client=(
+            ClientRead.model_construct(
+                id=client.id, name=client.name, phone=client.phone, created_at=client.created_at
+            )
+            if client is not None
+            else None
+        ),
+    )
+
+
 @router.post("", response_model=TransactionRead)
 async def create_transaction(
     payload: TransactionCreate,
@@ -27,7 +56,8 @@ async def create_transaction(
     """Create exchange transaction via manual payload."""
 
     tx = await engine.create_manual_transaction(session=session, payload=payload)
-    return TransactionRead.model_validate(tx)
+    await session.commit()
+    return _from_orm(tx)
 
 
 @router.post("/ai-confirm", response_model=TransactionRead)
@@ -39,34 +69,72 @@ async def create_transaction_from_ai(
     """Create transaction from operator-confirmed AI parse result."""
 
     tx = await engine.create_from_ai_confirmation(session=session, payload=payload)
-    return TransactionRead.model_validate(tx)
+    await session.commit()
+    return _from_orm(tx)
+
+
+def _encode_cursor(created_at: datetime, tx_id: int) -> str:
+    """Pack a (created_at, id) page boundary into an opaque cursor."""
+
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{tx_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Unpack a cursor produced by _encode_cursor."""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, _, tx_id = raw.partition("|")
+        return datetime.fromisoformat(timestamp), int(tx_id)
+    except (ValueError, binascii.Error) as exc:
+        raise ValidationError("Invalid pagination cursor") from exc
 
 
 @router.get("", response_model=TransactionHistoryResponse)
 async def transaction_history(
-    offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None),
     limit: int = Query(default=50, ge=1, le=500),
+    with_count: bool = Query(default=False),
     session: AsyncSession = Depends(get_session),
 ) -> TransactionHistoryResponse:
-    """Paginated transaction history newest first."""
+    """Keyset-paginated transaction history newest first.
 
-    total_result = await session.execute(select(func.count(Transaction.id)))
-    total = int(total_result.scalar_one())
+    Follow `next_cursor` for subsequent pages; `total` is only computed when
+    `with_count=true` since the full count is a table scan.
+    """
 
-    result = await session.execute(
+    query = (
         select(Transaction)
         .options(
-            joinedload(Transaction.from_currency),
-            joinedload(Transaction.to_currency),
-            joinedload(Transaction.client),
+            # selectinload keeps the page rows narrow: one small IN-select per
+            # relation instead of repeating currency/client columns on every
+            # row of the join. raiseload surfaces any accidental lazy load.
+            selectinload(Transaction.from_currency),
+            selectinload(Transaction.to_currency),
+            selectinload(Transaction.client),
+            raiseload("*"),
         )
         .order_by(Transaction.created_at.desc(), Transaction.id.desc())
-        .offset(offset)
-        .limit(limit)
+        # One extra row detects whether another page exists without a count.
+        .limit(limit + 1)
     )
-    items = list(result.scalars().all())
+    if cursor is not None:
+        after_ts, after_id = _decode_cursor(cursor)
+        query = query.where(tuple_(Transaction.created_at, Transaction.id) < (after_ts, after_id))
+
+    items = (await session.execute(query)).scalars().all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = _encode_cursor(items[-1].created_at, items[-1].id)
+
+    total = None
+    if with_count:
+        total = int(await session.scalar(select(func.count(Transaction.id))))
 
     return TransactionHistoryResponse(
         total=total,
-        items=[TransactionRead.model_validate(item) for item in items],
+        items=[_from_orm(item) for item in items],
+        next_cursor=next_cursor,
     )
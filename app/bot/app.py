@@ -26,8 +26,24 @@ async def run_bot() -> None:
     dispatcher.include_router(main_router)
     dispatcher.include_router(ai_chat_router)
 
-    await dispatcher.start_polling(bot)
+    # handle_as_tasks (aiogram's default) keeps slow AI handlers from blocking
+    # the next update batch; make it explicit and only subscribe to the update
+    # types the routers actually handle so Telegram skips sending the rest.
+    await dispatcher.start_polling(
+        bot,
+        handle_as_tasks=True,
+        allowed_updates=dispatcher.resolve_used_update_types(),
+    )
 
 
 if __name__ == "__main__":
+    # The API processes already run on uvloop via uvicorn's auto loop; pin the
+    # same libuv loop for the polling bot so its AI/HTTP awaits get the faster
+    # event loop too. uvloop ships with uvicorn[standard] but not on Windows.
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        uvloop.install()
     asyncio.run(run_bot())
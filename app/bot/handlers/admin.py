@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import Optional
+
 from aiogram import F, Router
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
@@ -17,14 +20,34 @@ from app.security.telegram_auth import parse_allowed_ids
 
 router = Router()
 
+# Static keyboards built once; aiogram treats them as immutable payloads.
+_ADMIN_MENU_KB = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [InlineKeyboardButton(text="🗑 Очистить базу данных", callback_data="admin_clear_db")],
+        [InlineKeyboardButton(text="📊 Статистика БД", callback_data="admin_db_stats")],
+        [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_close")],
+    ]
+)
+_ADMIN_CLEAR_CONFIRM_KB = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [InlineKeyboardButton(text="⚠️ Да, очистить ВСЁ", callback_data="admin_clear_db_yes")],
+        [InlineKeyboardButton(text="🗑 Только удалённые (soft)", callback_data="admin_clear_db_soft")],
+        [InlineKeyboardButton(text="❌ Отмена", callback_data="admin_clear_db_no")],
+    ]
+)
+
+
+@lru_cache(maxsize=1)
+def _owner_id() -> Optional[int]:
+    """Resolve the owner (first ID in ALLOWED_TELEGRAM_IDS) once per process."""
+    allowed = sorted(parse_allowed_ids(get_settings().allowed_telegram_ids))
+    return allowed[0] if allowed else None
+
 
 def _is_owner(user_id: int) -> bool:
     """Check if user is the first (owner) ID in ALLOWED_TELEGRAM_IDS."""
-    settings = get_settings()
-    allowed = sorted(parse_allowed_ids(settings.allowed_telegram_ids))
-    if not allowed:
-        return False
-    return user_id == allowed[0]
+    owner = _owner_id()
+    return owner is not None and user_id == owner
 
 
 @router.message(Command("admin"))
@@ -37,14 +60,7 @@ async def admin_menu(message: Message, state: FSMContext) -> None:
 
     await state.clear()
 
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="🗑 Очистить базу данных", callback_data="admin_clear_db")],
-            [InlineKeyboardButton(text="📊 Статистика БД", callback_data="admin_db_stats")],
-            [InlineKeyboardButton(text="🔙 Назад", callback_data="admin_close")],
-        ]
-    )
-    await message.answer(texts.ADMIN_MENU_TITLE, reply_markup=keyboard)
+    await message.answer(texts.ADMIN_MENU_TITLE, reply_markup=_ADMIN_MENU_KB)
 
 
 @router.callback_query(F.data == "admin_db_stats")
@@ -56,12 +72,17 @@ async def admin_db_stats(callback: CallbackQuery) -> None:
         return
 
     async with db_manager.session_factory() as session:
-        result = await session.execute(text("SELECT COUNT(*) FROM cash_entries WHERE deleted_at IS NULL"))
-        active_count = result.scalar_one()
-        result2 = await session.execute(text("SELECT COUNT(*) FROM cash_entries WHERE deleted_at IS NOT NULL"))
-        deleted_count = result2.scalar_one()
-        result3 = await session.execute(text("SELECT COUNT(*) FROM cash_entries"))
-        total_count = result3.scalar_one()
+        # One pass over the table instead of three separate counts.
+        row = (
+            await session.execute(
+                text(
+                    "SELECT COUNT(*) FILTER (WHERE deleted_at IS NULL) AS active, "
+                    "COUNT(*) FILTER (WHERE deleted_at IS NOT NULL) AS deleted, "
+                    "COUNT(*) AS total FROM cash_entries"
+                )
+            )
+        ).one()
+        active_count, deleted_count, total_count = row.active, row.deleted, row.total
 
     await callback.message.answer(
         f"📊 Статистика базы данных:\n\n"
@@ -80,20 +101,13 @@ async def admin_clear_db_confirm(callback: CallbackQuery) -> None:
         await callback.answer("⛔ Нет доступа", show_alert=True)
         return
 
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="⚠️ Да, очистить ВСЁ", callback_data="admin_clear_db_yes")],
-            [InlineKeyboardButton(text="🗑 Только удалённые (soft)", callback_data="admin_clear_db_soft")],
-            [InlineKeyboardButton(text="❌ Отмена", callback_data="admin_clear_db_no")],
-        ]
-    )
     await callback.message.edit_text(
         "⚠️ ВНИМАНИЕ!\n\n"
         "Выберите действие:\n"
         "• «Да, очистить ВСЁ» — удалит ВСЕ записи безвозвратно\n"
         "• «Только удалённые» — удалит только soft-deleted записи\n\n"
         "Это действие необратимо!",
-        reply_markup=keyboard,
+        reply_markup=_ADMIN_CLEAR_CONFIRM_KB,
     )
     await callback.answer()
 
@@ -109,9 +123,12 @@ async def admin_clear_db_execute(callback: CallbackQuery) -> None:
     await callback.message.edit_reply_markup(reply_markup=None)
 
     try:
-        async with db_manager.session_factory() as session:
-            async with session.begin():
-                await session.execute(text("TRUNCATE TABLE cash_entries RESTART IDENTITY CASCADE"))
+        # TRUNCATE takes an ACCESS EXCLUSIVE lock; running it on an autocommit
+        # connection releases the lock immediately instead of holding it for
+        # the rest of a transaction that shares the pool with every handler.
+        async with db_manager.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("TRUNCATE TABLE cash_entries RESTART IDENTITY CASCADE"))
         await callback.message.answer(
             "✅ База данных полностью очищена!\n"
             "Все записи удалены, счётчик ID сброшен.",
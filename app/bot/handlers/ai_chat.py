@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from decimal import Decimal, InvalidOperation
-from typing import Union
+from functools import lru_cache
+from typing import Optional, Union
 from zoneinfo import ZoneInfo
 
 from aiogram import F, Router
@@ -23,9 +24,45 @@ from app.services.entry_service import EntryService
 
 router = Router()
 
+# EntryService is stateless, so one shared instance serves every callback.
+_entry_service = EntryService()
+
+# Static confirmation keyboards built once; aiogram treats them as immutable.
+_AICHAT_CREATE_KB = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [InlineKeyboardButton(text="✅ Tasdiqlash", callback_data="aichat_create_yes")],
+        [InlineKeyboardButton(text="❌ Bekor qilish", callback_data="aichat_create_no")],
+    ]
+)
+_AICHAT_DELETE_KB = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [InlineKeyboardButton(text="✅ Ha, o'chir", callback_data="aichat_delete_yes")],
+        [InlineKeyboardButton(text="❌ Yo'q", callback_data="aichat_delete_no")],
+    ]
+)
+
+
+# Prebuilt single-char table: translate is faster than replace, and the
+# format spec handles Decimal/int/float directly without re-wrapping.
+_COMMA_TO_SPACE = str.maketrans({",": " "})
+
 
 def _fmt(value: Union[Decimal, int, float], currency: str) -> str:
-    return f"{Decimal(value):,.2f} {currency}".replace(",", " ")
+    return f"{value:,.2f} {currency}".translate(_COMMA_TO_SPACE)
+
+
+@lru_cache(maxsize=1)
+def _chat_service() -> Optional[AIChatService]:
+    """Build the chat service once so the underlying HTTP clients are reused."""
+
+    return AIChatService.from_settings(get_settings())
+
+
+@lru_cache(maxsize=1)
+def _context_builder() -> ChatContextBuilder:
+    """Single builder instance; its context cache then spans all messages."""
+
+    return ChatContextBuilder(base_currency_code=get_settings().base_currency_code)
 
 
 async def _ensure_allowed(message: Message) -> bool:
@@ -41,10 +78,7 @@ async def _ensure_allowed(message: Message) -> bool:
 async def start_ai_chat(message: Message, state: FSMContext) -> None:
     """Start AI chat mode."""
 
-    settings = get_settings()
-    chat_service = AIChatService.from_settings(settings)
-
-    if chat_service is None:
+    if _chat_service() is None:
         await message.answer(
             "AI chat sozlanmagan. .env faylida AI_PROVIDER va API kalitini tekshiring.",
             reply_markup=main_menu_keyboard(),
@@ -75,9 +109,7 @@ async def handle_ai_chat_question(message: Message, state: FSMContext) -> None:
         await message.answer("Вопрос пуст. Пожалуйста, напишите снова.")
         return
 
-    settings = get_settings()
-    chat_service = AIChatService.from_settings(settings)
-
+    chat_service = _chat_service()
     if chat_service is None:
         await message.answer("AI чат не работает.", reply_markup=main_menu_keyboard())
         await state.clear()
@@ -87,8 +119,7 @@ async def handle_ai_chat_question(message: Message, state: FSMContext) -> None:
 
     try:
         async with db_manager.session_factory() as session:
-            context_builder = ChatContextBuilder(base_currency_code=settings.base_currency_code)
-            context = await context_builder.build(session)
+            context = await _context_builder().build(session)
 
         result = await chat_service.answer(question=question, context=context)
         await thinking_msg.delete()
@@ -116,7 +147,11 @@ async def _handle_create_entry(message: Message, state: FSMContext, data: dict)
     """Show AI-parsed entry for confirmation before saving."""
 
     try:
-        amount = Decimal(str(data.get("amount", 0)))
+        raw_amount = data.get("amount", 0)
+        if isinstance(raw_amount, float):
+            # Round-trip floats through str so binary artifacts don't leak in.
+            raw_amount = str(raw_amount)
+        amount = Decimal(raw_amount)
         raw_currency = str(data.get("currency_code", ""))
         flow_direction = str(data.get("flow_direction", "")).upper()
         client_name = str(data.get("client_name", "")).strip()
@@ -133,7 +168,7 @@ async def _handle_create_entry(message: Message, state: FSMContext, data: dict)
             await message.answer("❌ Client nomi topilmadi. Qayta yozing.")
             return
 
-    except (InvalidOperation, ValueError):
+    except (InvalidOperation, TypeError, ValueError):
         await message.answer("❌ AI noto'g'ri ma'lumot qaytardi. Qayta urinib ko'ring.")
         return
 
@@ -157,13 +192,7 @@ async def _handle_create_entry(message: Message, state: FSMContext, data: dict)
         }
     )
 
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="✅ Tasdiqlash", callback_data="aichat_create_yes")],
-            [InlineKeyboardButton(text="❌ Bekor qilish", callback_data="aichat_create_no")],
-        ]
-    )
-    await message.answer(summary, reply_markup=keyboard)
+    await message.answer(summary, reply_markup=_AICHAT_CREATE_KB)
 
 
 async def _handle_delete_entry(message: Message, state: FSMContext, data: dict) -> None:
@@ -175,7 +204,7 @@ async def _handle_delete_entry(message: Message, state: FSMContext, data: dict)
         return
 
     entry_id = int(entry_id)
-    service = EntryService()
+    service = _entry_service
 
     async with db_manager.session_factory() as session:
         entry = await service.get_entry_by_id(session, entry_id)
@@ -200,13 +229,7 @@ async def _handle_delete_entry(message: Message, state: FSMContext, data: dict)
 
     await state.update_data(ai_delete_id=entry_id)
 
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="✅ Ha, o'chir", callback_data="aichat_delete_yes")],
-            [InlineKeyboardButton(text="❌ Yo'q", callback_data="aichat_delete_no")],
-        ]
-    )
-    await message.answer(summary, reply_markup=keyboard)
+    await message.answer(summary, reply_markup=_AICHAT_DELETE_KB)
 
 
 # --- Callback handlers ---
@@ -231,7 +254,7 @@ async def confirm_ai_create(callback, state: FSMContext):
             client_name=parsed["client_name"],
             note=parsed.get("note"),
         )
-        service = EntryService()
+        service = _entry_service
         async with db_manager.session_factory() as session:
             entry = await service.create_entry(
                 session=session,
@@ -271,7 +294,7 @@ async def confirm_ai_delete(callback, state: FSMContext):
         await callback.answer()
         return
 
-    service = EntryService()
+    service = _entry_service
     async with db_manager.session_factory() as session:
         entry = await service.soft_delete_entry(session, entry_id, user_id=callback.from_user.id)
 
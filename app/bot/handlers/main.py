@@ -2,16 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 from datetime import datetime
 from decimal import Decimal
+from functools import lru_cache
 from typing import Union
 from zoneinfo import ZoneInfo
 
 from aiogram import F, Router
 from aiogram.filters import Command, CommandStart
 from aiogram.fsm.context import FSMContext
-from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
+from aiogram.types import FSInputFile, InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 from app.ai.parser import AIParserService
 from app.bot import texts
@@ -26,9 +28,54 @@ from app.services.entry_service import EntryService
 
 router = Router()
 
+# EntryService is stateless, so one shared instance serves every handler.
+_entry_service = EntryService()
+
+
+# Prebuilt single-char table: translate is faster than replace, and the
+# format spec handles Decimal/int/float directly without re-wrapping.
+_COMMA_TO_SPACE = str.maketrans({",": " "})
+
+# Static lookup constants for the per-update hot paths.
+_GREETING_RE = re.compile(r"^(hello|hi|hey|salom|assalomu alaykum)$", re.IGNORECASE)
+_AI_GREETINGS = frozenset({"hello", "hi", "hey", "salom", "привет", "здравствуйте"})
+_ALLOWED_CURRENCIES = frozenset({"USD", "RUB", "UZS", "KGS", "EUR"})
+_INFLOW_TOKENS = frozenset({"in", "kirim", "+", "i", "приход"})
+_OUTFLOW_TOKENS = frozenset({"out", "chiqim", "-", "o", "расход"})
+_DIRECTION_MAP = {token: "INFLOW" for token in _INFLOW_TOKENS} | {
+    token: "OUTFLOW" for token in _OUTFLOW_TOKENS
+}
+_EDITABLE_FIELDS = frozenset({"amount", "currency", "direction", "client", "note"})
+
+# Bound core validator: skips the model_validate classmethod dispatch on the
+# confirm hot paths (same trick as app.ai.validation).
+_validate_entry = EntryCreate.__pydantic_validator__.validate_python
+
+# Static confirmation keyboards built once; aiogram treats them as immutable.
+_MANUAL_CONFIRM_KB = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [InlineKeyboardButton(text="✅ Подтвердить", callback_data="manual_confirm")],
+        [InlineKeyboardButton(text="❌ Отменить", callback_data="manual_cancel")],
+    ]
+)
+_AI_CONFIRM_KB = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [InlineKeyboardButton(text="✅ Подтвердить", callback_data="ai_confirm")],
+        [InlineKeyboardButton(text="✏️ Изменить", callback_data="ai_edit")],
+        [InlineKeyboardButton(text="❌ Отменить", callback_data="ai_cancel")],
+    ]
+)
+
 
 def _fmt(value: Union[Decimal, int, float], currency: str) -> str:
-    return f"{Decimal(value):,.2f} {currency}".replace(",", " ")
+    return f"{value:,.2f} {currency}".translate(_COMMA_TO_SPACE)
+
+
+@lru_cache(maxsize=1)
+def _ai_parser() -> AIParserService:
+    """Build the parser once; its HTTP client pool then outlives any message."""
+
+    return AIParserService.from_settings(get_settings())
 
 
 async def _ensure_allowed_message(message: Message) -> bool:
@@ -70,7 +117,7 @@ async def on_start(message: Message, state: FSMContext) -> None:
     await message.answer(texts.MAIN_MENU_TITLE, reply_markup=main_menu_keyboard())
 
 
-@router.message(F.text.regexp(re.compile(r"^(hello|hi|hey|salom|assalomu alaykum)$", re.IGNORECASE)))
+@router.message(F.text.regexp(_GREETING_RE))
 async def on_greeting(message: Message) -> None:
     """Reply to greetings and point user to main actions."""
 
@@ -135,7 +182,7 @@ async def entry_currency(message: Message, state: FSMContext) -> None:
         return
 
     currency = (message.text or "").strip().upper()
-    if currency not in {"USD", "RUB", "UZS", "KGS", "EUR"}:
+    if currency not in _ALLOWED_CURRENCIES:
         await message.answer("Валюта должна быть USD, RUB, UZS, KGS или EUR.")
         return
 
@@ -194,15 +241,8 @@ async def entry_note(message: Message, state: FSMContext) -> None:
     await state.update_data(note=note)
 
     data = await state.get_data()
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="✅ Подтвердить", callback_data="manual_confirm")],
-            [InlineKeyboardButton(text="❌ Отменить", callback_data="manual_cancel")],
-        ]
-    )
-
     await state.set_state(ManualEntryStates.waiting_confirm)
-    await message.answer(_summary_from_data(data), reply_markup=keyboard)
+    await message.answer(_summary_from_data(data), reply_markup=_MANUAL_CONFIRM_KB)
 
 
 @router.callback_query(F.data == "manual_cancel")
@@ -223,18 +263,16 @@ async def manual_confirm(callback, state: FSMContext):
 
     if not await _ensure_allowed_callback(callback):
         return
+    # Ack first so the button spinner stops before the DB write runs.
+    await callback.answer()
     await callback.message.edit_reply_markup(reply_markup=None)
 
     data = await state.get_data()
     try:
-        payload = EntryCreate(
-            amount=Decimal(data["amount"]),
-            currency_code=data["currency_code"],
-            flow_direction=data["flow_direction"],
-            client_name=data["client_name"],
-            note=data.get("note"),
-        )
-        service = EntryService()
+        # State data already holds exactly the EntryCreate fields; the
+        # validator coerces the stringified amount back to Decimal.
+        payload = _validate_entry(data)
+        service = _entry_service
         async with db_manager.session_factory() as session:
             entry = await service.create_entry(
                 session=session,
@@ -246,7 +284,6 @@ async def manual_confirm(callback, state: FSMContext):
         await callback.message.answer(f"Ошибка: {exc}")
 
     await state.clear()
-    await callback.answer()
 
 
 @router.message(F.text == texts.AI_ASSISTANT_INPUT)
@@ -268,13 +305,12 @@ async def ai_raw_input(message: Message, state: FSMContext) -> None:
         return
 
     text = (message.text or "").strip()
-    if text.lower() in {"hello", "hi", "hey", "salom", "привет", "здравствуйте"}:
+    if text.lower() in _AI_GREETINGS:
         await message.answer("Привет. Отправьте текст записи: 'Али дал 1000 usd'.")
         return
 
     try:
-        parser = AIParserService.from_settings(get_settings())
-        parsed = await parser.parse(text)
+        parsed = await _ai_parser().parse(text)
     except Exception as exc:  # noqa: BLE001
         await message.answer(f"AI parse failed: {exc}")
         return
@@ -289,14 +325,7 @@ async def ai_raw_input(message: Message, state: FSMContext) -> None:
     await state.update_data(ai_parsed=data)
     await state.set_state(AIInputStates.waiting_confirm)
 
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="✅ Подтвердить", callback_data="ai_confirm")],
-            [InlineKeyboardButton(text="✏️ Изменить", callback_data="ai_edit")],
-            [InlineKeyboardButton(text="❌ Отменить", callback_data="ai_cancel")],
-        ]
-    )
-    await message.answer(_summary_from_data(data), reply_markup=keyboard)
+    await message.answer(_summary_from_data(data), reply_markup=_AI_CONFIRM_KB)
 
 
 @router.message(AIInputStates.waiting_client)
@@ -317,14 +346,7 @@ async def ai_client_input(message: Message, state: FSMContext) -> None:
     await state.update_data(ai_parsed=parsed)
     await state.set_state(AIInputStates.waiting_confirm)
 
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="✅ Подтвердить", callback_data="ai_confirm")],
-            [InlineKeyboardButton(text="✏️ Изменить", callback_data="ai_edit")],
-            [InlineKeyboardButton(text="❌ Отменить", callback_data="ai_cancel")],
-        ]
-    )
-    await message.answer(_summary_from_data(parsed), reply_markup=keyboard)
+    await message.answer(_summary_from_data(parsed), reply_markup=_AI_CONFIRM_KB)
 
 
 @router.callback_query(F.data == "ai_edit")
@@ -356,16 +378,18 @@ async def ai_confirm(callback, state: FSMContext):
     if not await _ensure_allowed_callback(callback):
         return
 
+    # Ack first so the button spinner stops before the DB write runs.
+    await callback.answer()
+
     data = await state.get_data()
     parsed = data.get("ai_parsed")
     if not parsed:
         await callback.message.answer("Нет данных.")
-        await callback.answer()
         return
 
     try:
-        payload = EntryCreate.model_validate(parsed)
-        service = EntryService()
+        payload = _validate_entry(parsed)
+        service = _entry_service
         async with db_manager.session_factory() as session:
             entry = await service.create_entry(
                 session=session,
@@ -377,7 +401,6 @@ async def ai_confirm(callback, state: FSMContext):
         await callback.message.answer(f"Ошибка: {exc}")
 
     await state.clear()
-    await callback.answer()
 
 
 @router.message(F.text == texts.REPORTS)
@@ -388,28 +411,35 @@ async def show_reports(message: Message) -> None:
         return
 
     settings = get_settings()
-    service = EntryService()
+    service = _entry_service
     today = datetime.now(ZoneInfo(settings.timezone)).date()
 
-    async with db_manager.session_factory() as session:
-        balances = await service.currency_balances(session)
-        daily_profits = await service.daily_profit_by_currency(session, today)
-        debts = await service.client_debts(session)
-        _, kgs_total = await service.cash_total(session)
-        entries = await service.entries_for_day(session, today)
-
-    lines = [f"📊 Отчет ({today.isoformat()}):", ""]
+    async def _q(query):
+        # One session per query: an async session cannot run statements
+        # concurrently, so each read gets its own pooled connection.
+        async with db_manager.session_factory() as session:
+            return await query(session)
+
+    balances, daily_profits, debts, (_, kgs_total), entries = await asyncio.gather(
+        _q(service.currency_balances),
+        _q(lambda s: service.daily_profit_by_currency(s, today)),
+        _q(service.client_debts),
+        _q(service.cash_total),
+        _q(lambda s: service.entries_for_day(s, today)),
+    )
 
-    lines.append("💰 Баланс (по валютам):")
-    for currency, amount in sorted(balances.items()):
-        lines.append(f"  {currency}: {_fmt(amount, currency)}")
+    # Sections are extended with generators so each row renders in a single
+    # f-string pass (same pattern as the chat context builder).
+    lines = [f"📊 Отчет ({today.isoformat()}):", "", "💰 Баланс (по валютам):"]
+    lines.extend(f"  {currency}: {_fmt(amount, currency)}" for currency, amount in sorted(balances.items()))
 
     lines.append("")
     lines.append("📈 Сегодняшняя чистая прибыль (Приход - Расход):")
     if daily_profits:
-        for currency, amount in sorted(daily_profits.items()):
-            sign = "+" if amount >= 0 else ""
-            lines.append(f"  {currency}: {sign}{_fmt(amount, currency)}")
+        lines.extend(
+            f"  {currency}: {'+' if amount >= 0 else ''}{_fmt(amount, currency)}"
+            for currency, amount in sorted(daily_profits.items())
+        )
     else:
         lines.append("  Сегодня операций нет.")
 
@@ -419,18 +449,19 @@ async def show_reports(message: Message) -> None:
     if entries:
         lines.append("")
         lines.append("Последние операции:")
-        for entry in entries[-10:]:
-            sign = "взял +" if entry.flow_direction == "INFLOW" else "продал -"
-            note_str = f" | {entry.note}" if entry.note else ""
-            lines.append(
-                f"  #{entry.id} | {sign} {_fmt(entry.amount, entry.currency_code)} "
-                f"| {entry.client_name}{note_str}"
-            )
+        lines.extend(
+            f"  #{entry.id} | {'взял +' if entry.flow_direction == 'INFLOW' else 'продал -'} "
+            f"{_fmt(entry.amount, entry.currency_code)} | {entry.client_name}"
+            f"{f' | {entry.note}' if entry.note else ''}"
+            for entry in entries[-10:]
+        )
 
     lines.append("")
     lines.append("Долги по клиентам (топ 10):")
-    for client_name, currency, debt, last_updated in debts[:10]:
-        lines.append(f"  {client_name} [{currency}]: {_fmt(debt, currency)}")
+    lines.extend(
+        f"  {client_name} [{currency}]: {_fmt(debt, currency)}"
+        for client_name, currency, debt, _ in debts[:10]
+    )
 
     lines.append("")
     lines.append(f"💵 Итого в кассе (KGS): {_fmt(kgs_total, 'KGS')}")
@@ -449,17 +480,21 @@ async def export_csv(message: Message) -> None:
     today = datetime.now(ZoneInfo(settings.timezone)).date()
     scheduler = BackupScheduler(db_manager.session_factory, settings)
 
+    # Immediate feedback: the export plus two uploads can take a while.
+    await message.answer("⏳ Готовлю CSV экспорт...")
+
     try:
         result = await scheduler.run_once(today)
 
         # Send CSV files directly to the user's chat
-        from aiogram.types import FSInputFile
-
         entries_file = FSInputFile(str(result.entries_csv), filename=result.entries_csv.name)
         reports_file = FSInputFile(str(result.reports_csv), filename=result.reports_csv.name)
 
-        await message.answer_document(entries_file, caption=f"📋 Записи: {today.isoformat()}")
-        await message.answer_document(reports_file, caption=f"📊 Отчеты: {today.isoformat()}")
+        # Both uploads are independent; overlap their round-trips.
+        await asyncio.gather(
+            message.answer_document(entries_file, caption=f"📋 Записи: {today.isoformat()}"),
+            message.answer_document(reports_file, caption=f"📊 Отчеты: {today.isoformat()}"),
+        )
         await message.answer("✅ CSV файлы отправлены!", reply_markup=main_menu_keyboard())
 
     except Exception as exc:  # noqa: BLE001
@@ -479,7 +514,7 @@ async def delete_entry_command(message: Message) -> None:
         return
 
     entry_id = int(parts[1])
-    service = EntryService()
+    service = _entry_service
 
     async with db_manager.session_factory() as session:
         entry = await service.get_entry_by_id(session, entry_id)
@@ -520,7 +555,7 @@ async def confirm_delete(callback, state: FSMContext):
     await callback.message.edit_reply_markup(reply_markup=None)
 
     entry_id = int(callback.data.split("_")[-1])
-    service = EntryService()
+    service = _entry_service
 
     async with db_manager.session_factory() as session:
         entry = await service.soft_delete_entry(session, entry_id, user_id=callback.from_user.id)
@@ -543,8 +578,10 @@ async def cancel_delete(callback, state: FSMContext):
 
     if not await _ensure_allowed_callback(callback):
         return
-    await callback.message.edit_reply_markup(reply_markup=None)
-    await callback.message.answer("Удаление отменено.", reply_markup=main_menu_keyboard())
+    # One edit replaces the confirmation text and clears the inline buttons,
+    # instead of a markup edit plus a separate message. The persistent main
+    # menu reply keyboard is unaffected.
+    await callback.message.edit_text("Удаление отменено.")
     await callback.answer()
 
 
@@ -561,7 +598,7 @@ async def restore_entry_command(message: Message) -> None:
         return
 
     entry_id = int(parts[1])
-    service = EntryService()
+    service = _entry_service
 
     async with db_manager.session_factory() as session:
         entry = await service.restore_entry(session, entry_id, user_id=message.from_user.id)
@@ -608,11 +645,8 @@ async def quick_entry_command(message: Message) -> None:
     direction_raw = direction_raw.lower()
 
     # Parse direction
-    if direction_raw in {"in", "kirim", "+", "i", "приход"}:
-        direction = "INFLOW"
-    elif direction_raw in {"out", "chiqim", "-", "o", "расход"}:
-        direction = "OUTFLOW"
-    else:
+    direction = _DIRECTION_MAP.get(direction_raw)
+    if direction is None:
         await message.answer(f"❌ Неверное направление: '{direction_raw}'\nИспользуйте: in или out")
         return
 
@@ -645,7 +679,7 @@ async def quick_entry_command(message: Message) -> None:
         return
 
     user_id = message.from_user.id if message.from_user else 0
-    service = EntryService()
+    service = _entry_service
 
     async with db_manager.session_factory() as session:
         entry = await service.create_entry(session, payload, user_id)
@@ -696,12 +730,11 @@ async def edit_entry_command(message: Message) -> None:
     entry_id = int(entry_id_str)
     field = field.lower().strip()
 
-    allowed_fields = {"amount", "currency", "direction", "client", "note"}
-    if field not in allowed_fields:
-        await message.answer(f"❌ Неверное поле: '{field}'\nРазрешены: {', '.join(sorted(allowed_fields))}")
+    if field not in _EDITABLE_FIELDS:
+        await message.answer(f"❌ Неверное поле: '{field}'\nРазрешены: {', '.join(sorted(_EDITABLE_FIELDS))}")
         return
 
-    service = EntryService()
+    service = _entry_service
 
     async with db_manager.session_factory() as session:
         entry = await service.get_entry_by_id(session, entry_id)
@@ -723,9 +756,7 @@ async def edit_entry_command(message: Message) -> None:
         elif field == "currency":
             new_currency = new_value.upper().strip()
         elif field == "direction":
-            mapping = {"in": "INFLOW", "kirim": "INFLOW", "+": "INFLOW",
-                       "out": "OUTFLOW", "chiqim": "OUTFLOW", "-": "OUTFLOW"}
-            new_direction = mapping.get(new_value.lower(), new_value.upper())
+            new_direction = _DIRECTION_MAP.get(new_value.lower(), new_value.upper())
         elif field == "client":
             new_client = new_value.strip()
         elif field == "note":
@@ -742,18 +773,20 @@ async def edit_entry_command(message: Message) -> None:
         await message.answer(f"❌ Новое значение неверно: {exc}")
         return
 
-    # Soft delete old, create new
+    # One UPDATE in place of the old soft-delete + re-insert pair.
     user_id = message.from_user.id if message.from_user else 0
 
     async with db_manager.session_factory() as session:
-        await service.soft_delete_entry(session, entry_id, user_id=user_id)
-        new_entry = await service.create_entry(session, updated_payload, user_id)
+        new_entry = await service.update_entry(session, entry_id, updated_payload, user_id)
+
+    if new_entry is None:
+        await message.answer(f"❌ Запись #{entry_id} не найдена.")
+        return
 
     sign = "➕ +" if new_entry.flow_direction == "INFLOW" else "➖ -"
     await message.answer(
-        f"✅ Запись #{entry_id} обновлена → #{new_entry.id}\n"
-        f"{sign} {_fmt(new_entry.amount, new_entry.currency_code)} | {new_entry.client_name}\n"
-        f"(Старая #{entry_id} заархивирована)",
+        f"✅ Запись #{entry_id} обновлена\n"
+        f"{sign} {_fmt(new_entry.amount, new_entry.currency_code)} | {new_entry.client_name}",
         reply_markup=main_menu_keyboard(),
     )
 
@@ -1,5 +1,7 @@
 """Reply keyboard builders."""
 
+from functools import lru_cache
+
 from aiogram.types import KeyboardButton, ReplyKeyboardMarkup
 from aiogram.types.web_app_info import WebAppInfo
 
@@ -7,8 +9,13 @@ from app.bot import texts
 from app.config import get_settings
 
 
+@lru_cache(maxsize=1)
 def main_menu_keyboard() -> ReplyKeyboardMarkup:
-    """Main menu keyboard with operator actions."""
+    """Main menu keyboard with operator actions.
+
+    The layout only depends on process-constant settings, so it is built
+    once and the same markup object is reused by every handler reply.
+    """
 
     settings = get_settings()
     
@@ -6,7 +6,8 @@ from decimal import Decimal
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import BigInteger, CheckConstraint, DateTime, ForeignKey, Index, Numeric, String, func
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, ForeignKey, Index, Numeric, String, func, text
+from sqlalchemy import Enum as SqlEnum
 from sqlalchemy import event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -54,15 +55,32 @@ class Transaction(Base):
     """Exchange operation (outgoing currency and incoming currency)."""
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Covering index for latest-rate lookups by currency pair.
+        Index(
+            "ix_transactions_pair_created_desc",
+            "from_currency_id",
+            "to_currency_id",
+            text("created_at DESC"),
+            postgresql_include=["rate"],
+        ),
+        # Keyset pagination walks (created_at, id) descending; the composite
+        # also covers plain created_at range scans.
+        Index(
+            "ix_transactions_created_id_desc",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    from_currency_id: Mapped[int] = mapped_column(ForeignKey("currencies.id"), index=True)
-    to_currency_id: Mapped[int] = mapped_column(ForeignKey("currencies.id"), index=True)
+    from_currency_id: Mapped[int] = mapped_column(ForeignKey("currencies.id"))
+    to_currency_id: Mapped[int] = mapped_column(ForeignKey("currencies.id"))
     from_amount: Mapped[Decimal] = mapped_column(Numeric(24, 8))
     to_amount: Mapped[Decimal] = mapped_column(Numeric(24, 8))
     rate: Mapped[Decimal] = mapped_column(Numeric(24, 8))
     client_id: Mapped[Optional[int]] = mapped_column(ForeignKey("clients.id"), nullable=True, index=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     from_currency: Mapped[Currency] = relationship(foreign_keys=[from_currency_id])
     to_currency: Mapped[Currency] = relationship(foreign_keys=[to_currency_id])
@@ -91,28 +109,51 @@ class CashEntry(Base):
     __tablename__ = "cash_entries"
     __table_args__ = (
         CheckConstraint("amount > 0", name="ck_cash_entries_amount_positive"),
-        CheckConstraint(
-            "currency_code IN ('USD', 'RUB', 'UZS', 'KGS', 'EUR')",
-            name="ck_cash_entries_currency_code_allowed",
+        Index("ix_cash_entries_currency_created", "currency_code", "created_at"),
+        # Covering index for the chat-context reads: last-N scans walk
+        # created_at DESC directly and the balance/net sums are index-only.
+        Index(
+            "ix_cash_entries_created_currency_flow",
+            text("created_at DESC"),
+            "currency_code",
+            "flow_direction",
+            "amount",
         ),
-        CheckConstraint(
-            "flow_direction IN ('INFLOW', 'OUTFLOW')",
-            name="ck_cash_entries_flow_direction_allowed",
+        # Partial index over live rows only: every context/report read filters
+        # deleted_at IS NULL, so the last-N scan never touches soft-deleted
+        # entries.
+        Index(
+            "ix_cash_entries_created_at_live",
+            text("created_at DESC"),
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Mirror partial index over soft-deleted rows so the admin purge
+        # (DELETE WHERE deleted_at IS NOT NULL) never scans live entries.
+        Index(
+            "ix_cash_entries_soft_deleted",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL"),
         ),
-        Index("ix_cash_entries_currency_created", "currency_code", "created_at"),
         Index("ix_cash_entries_client_currency_created", "client_name", "currency_code", "created_at"),
         Index("ix_cash_entries_created_by_created", "created_by_telegram_id", "created_at"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     amount: Mapped[Decimal] = mapped_column(Numeric(24, 8))
-    currency_code: Mapped[str] = mapped_column(String(3), index=True)
-    flow_direction: Mapped[str] = mapped_column(String(8), index=True)
-    client_name: Mapped[str] = mapped_column(String(128), index=True)
+    currency_code: Mapped[str] = mapped_column(
+        SqlEnum("USD", "RUB", "UZS", "KGS", "EUR", name="currency_code_enum", length=3)
+    )
+    flow_direction: Mapped[str] = mapped_column(
+        SqlEnum("INFLOW", "OUTFLOW", name="flow_direction_enum", length=8), index=True
+    )
+    client_name: Mapped[str] = mapped_column(String(128))
     note: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
-    created_by_telegram_id: Mapped[int] = mapped_column(BigInteger, index=True)
+    created_by_telegram_id: Mapped[int] = mapped_column(BigInteger)
     updated_by_telegram_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, default=None)
     deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, default=None, index=True)
 
 
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import get_settings
 
@@ -12,7 +12,17 @@ class DatabaseManager:
 
     def __init__(self) -> None:
         settings = get_settings()
-        self._engine = create_async_engine(settings.database_url, echo=settings.debug, pool_pre_ping=True)
+        # Bot and API share this pool; size it explicitly instead of relying
+        # on the 5+10 defaults, and recycle idle connections before the
+        # server-side timeout drops them.
+        self._engine = create_async_engine(
+            settings.database_url,
+            echo=settings.debug,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=settings.db_pool_recycle,
+        )
         self._session_factory = async_sessionmaker(
             self._engine,
             class_=AsyncSession,
@@ -31,6 +41,12 @@ class DatabaseManager:
 
         await self._engine.dispose()
 
+    @property
+    def engine(self) -> AsyncEngine:
+        """Expose the engine for connection-level work (DDL, autocommit)."""
+
+        return self._engine
+
     @property
     def session_factory(self) -> async_sessionmaker[AsyncSession]:
         """Expose the configured sessionmaker for use in services and bot."""
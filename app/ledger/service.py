@@ -13,25 +13,24 @@ from app.database.models import Currency, LedgerEntry
 class LedgerService:
     """Service focused on immutable ledger operations and projections."""
 
-    async def create_double_entries(
+    def build_double_entries(
         self,
-        session: AsyncSession,
         *,
-        transaction_id: int,
         from_currency_id: int,
         to_currency_id: int,
         from_amount: Decimal,
         to_amount: Decimal,
     ) -> list[LedgerEntry]:
-        """Create immutable debit/credit pair for an exchange transaction."""
+        """Build the immutable debit/credit pair for an exchange transaction.
 
-        entries = [
-            LedgerEntry(currency_id=from_currency_id, transaction_id=transaction_id, amount=-abs(from_amount)),
-            LedgerEntry(currency_id=to_currency_id, transaction_id=transaction_id, amount=abs(to_amount)),
+        The entries are returned unsaved so the caller can attach them to the
+        parent Transaction and persist everything in a single flush.
+        """
+
+        return [
+            LedgerEntry(currency_id=from_currency_id, amount=-abs(from_amount)),
+            LedgerEntry(currency_id=to_currency_id, amount=abs(to_amount)),
         ]
-        session.add_all(entries)
-        await session.flush()
-        return entries
 
     async def balance_by_currency(self, session: AsyncSession) -> list[tuple[str, Decimal]]:
         """Compute balances from ledger sums grouped by currency code."""
@@ -53,5 +52,4 @@ class LedgerService:
             .join(Currency, Currency.id == LedgerEntry.currency_id)
             .where(Currency.code == currency_code.upper())
         )
-        result = await session.execute(query)
-        return result.scalar_one()
+        return await session.scalar(query)
@@ -10,9 +10,9 @@ from typing import Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased
 
-from app.database.models import Transaction
+from app.database.models import Currency, Transaction
 from app.schemas.report import ProfitByCurrency, ProfitReport
 
 
@@ -38,26 +38,34 @@ class ProfitService:
     ) -> ProfitReport:
         """Calculate realized profit breakdown for buy/sell operations."""
 
+        # Core column select: this read-only replay only needs five values per
+        # transaction, so skip ORM hydration and the joinedload row width.
+        from_currency = aliased(Currency)
+        to_currency = aliased(Currency)
         query = (
-            select(Transaction)
-            .options(
-                joinedload(Transaction.from_currency),
-                joinedload(Transaction.to_currency),
+            select(
+                Transaction.created_at,
+                Transaction.from_amount,
+                Transaction.to_amount,
+                from_currency.code.label("from_code"),
+                to_currency.code.label("to_code"),
             )
+            .join(from_currency, Transaction.from_currency_id == from_currency.id)
+            .join(to_currency, Transaction.to_currency_id == to_currency.id)
             .order_by(Transaction.created_at.asc(), Transaction.id.asc())
         )
         if end_at is not None:
             query = query.where(Transaction.created_at <= end_at)
 
         result = await session.execute(query)
-        transactions = list(result.scalars().all())
+        transactions = result.all()
 
         inventory: dict[str, InventoryState] = defaultdict(InventoryState)
         realized: dict[str, Decimal] = defaultdict(lambda: Decimal("0"))
 
         for tx in transactions:
-            from_code = tx.from_currency.code
-            to_code = tx.to_currency.code
+            from_code = tx.from_code
+            to_code = tx.to_code
 
             if from_code == self.base_currency_code and to_code != self.base_currency_code:
                 # Buy foreign currency: increase inventory quantity/cost.
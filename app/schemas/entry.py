@@ -23,7 +23,10 @@ class EntryCreate(BaseModel):
     @field_validator("client_name")
     @classmethod
     def normalize_client_name(cls, value: str) -> str:
-        return value.strip().title()
+        stripped = value.strip()
+        if not stripped:
+            raise ValueError("client_name must not be blank")
+        return stripped.title()
 
     @field_validator("currency_code")
     @classmethod
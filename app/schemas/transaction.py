@@ -43,10 +43,11 @@ class TransactionRead(ORMBaseSchema):
 
 
 class TransactionHistoryResponse(BaseModel):
-    """Paginated transaction history response."""
+    """Keyset-paginated transaction history response."""
 
-    total: int
+    total: Optional[int] = None
     items: list[TransactionRead]
+    next_cursor: Optional[str] = None
 
 
 class AIOperatorConfirmRequest(BaseModel):
@@ -5,6 +5,7 @@ from __future__ import annotations
 import hashlib
 import hmac
 import json
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import parse_qsl
 
@@ -29,10 +30,22 @@ def parse_allowed_ids(raw: str) -> set[int]:
     return ids
 
 
+@lru_cache(maxsize=4)
+def allowed_ids_cached(raw: str) -> frozenset[int]:
+    """Parse the whitelist once per distinct config string.
+
+    Auth checks run on every bot update and API request; caching on the raw
+    string keeps them at a set lookup while still tracking settings changes
+    (tests swap the env between cases).
+    """
+
+    return frozenset(parse_allowed_ids(raw))
+
+
 def is_bot_user_allowed(user_id: int, settings: Settings) -> bool:
     """Return whether bot user is allowed by configured whitelist."""
 
-    allowed = parse_allowed_ids(settings.allowed_telegram_ids)
+    allowed = allowed_ids_cached(settings.allowed_telegram_ids)
     if not allowed:
         return True
     return user_id in allowed
@@ -105,7 +118,7 @@ async def require_api_auth(
 ) -> Optional[int]:
     """Enforce request-level Telegram auth for API routes."""
 
-    allowed = parse_allowed_ids(settings.allowed_telegram_ids)
+    allowed = allowed_ids_cached(settings.allowed_telegram_ids)
     enforce = settings.telegram_webapp_enforce or bool(allowed)
 
     user_id = _extract_telegram_id_from_request(
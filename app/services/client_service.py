@@ -17,7 +17,7 @@ class ClientService:
         """Return newest clients first."""
 
         result = await session.execute(select(Client).order_by(Client.created_at.desc()).limit(limit))
-        return list(result.scalars().all())
+        return result.scalars().all()
 
     async def create_client(self, session: AsyncSession, name: str, phone: Optional[str] = None) -> Client:
         """Create and persist a new client."""
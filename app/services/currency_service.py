@@ -16,7 +16,7 @@ class CurrencyService:
         """List all available currencies sorted by code."""
 
         result = await session.execute(select(Currency).order_by(Currency.code.asc()))
-        return list(result.scalars().all())
+        return result.scalars().all()
 
     async def get_by_code(self, session: AsyncSession, code: str) -> Currency:
         """Resolve a currency by ISO code."""
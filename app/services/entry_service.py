@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime, time
+from datetime import date, datetime, time, timezone
 from decimal import Decimal
 from typing import Optional
 from zoneinfo import ZoneInfo
 
 from sqlalchemy import case, func, select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncScalarResult, AsyncSession
 
 from app.config import get_settings
 from app.database.models import CashEntry
@@ -54,20 +54,54 @@ class EntryService:
 
     async def soft_delete_entry(self, session: AsyncSession, entry_id: int, user_id: int) -> Optional[CashEntry]:
         """Soft delete an entry by setting deleted_at. Returns the entry or None if not found.
-        Uses pessimistic locking to prevent concurrency issues."""
+
+        A single UPDATE ... RETURNING replaces the earlier SELECT FOR UPDATE
+        plus flush/refresh: the deleted_at IS NULL predicate makes the
+        operation atomic, so no row lock round-trip is needed.
+        """
 
         async with session.begin():
             result = await session.execute(
-                select(CashEntry).where(CashEntry.id == entry_id, _not_deleted).with_for_update()
+                update(CashEntry)
+                .where(CashEntry.id == entry_id, _not_deleted)
+                .values(
+                    deleted_at=datetime.now(timezone.utc),
+                    updated_at=datetime.now(timezone.utc),
+                    updated_by_telegram_id=user_id,
+                )
+                .returning(CashEntry)
             )
-            entry = result.scalar_one_or_none()
-            if entry is None:
-                return None
-            entry.deleted_at = datetime.utcnow()
-            entry.updated_by_telegram_id = user_id
-            await session.flush()
-            await session.refresh(entry)
-            return entry
+            return result.scalar_one_or_none()
+
+    async def update_entry(
+        self,
+        session: AsyncSession,
+        entry_id: int,
+        payload: EntryCreate,
+        user_id: int,
+    ) -> Optional[CashEntry]:
+        """Overwrite an active entry's fields in a single UPDATE ... RETURNING.
+
+        Returns the updated row, or None when the entry is missing or
+        soft-deleted.
+        """
+
+        async with session.begin():
+            result = await session.execute(
+                update(CashEntry)
+                .where(CashEntry.id == entry_id, _not_deleted)
+                .values(
+                    amount=payload.amount,
+                    currency_code=payload.currency_code,
+                    flow_direction=payload.flow_direction,
+                    client_name=payload.client_name,
+                    note=payload.note,
+                    updated_at=datetime.now(timezone.utc),
+                    updated_by_telegram_id=user_id,
+                )
+                .returning(CashEntry)
+            )
+            return result.scalar_one_or_none()
 
     async def restore_entry(self, session: AsyncSession, entry_id: int, user_id: int) -> Optional[CashEntry]:
         """Restore a soft-deleted entry by clearing deleted_at.
@@ -84,6 +118,7 @@ class EntryService:
             if entry is None:
                 return None
             entry.deleted_at = None
+            entry.updated_at = datetime.now(timezone.utc)
             entry.updated_by_telegram_id = user_id
             await session.flush()
             await session.refresh(entry)
@@ -112,9 +147,7 @@ class EntryService:
         if currency:
             filters.append(CashEntry.currency_code == currency.upper())
 
-        total_query = select(func.count(CashEntry.id)).where(*filters)
-        total_result = await session.execute(total_query)
-        total = int(total_result.scalar_one())
+        total = int(await session.scalar(select(func.count(CashEntry.id)).where(*filters)))
 
         query = (
             select(CashEntry)
@@ -125,7 +158,7 @@ class EntryService:
         )
 
         rows = await session.execute(query)
-        items = list(rows.scalars().all())
+        items = rows.scalars().all()
         return total, items
 
     async def daily_profit_by_currency(self, session: AsyncSession, target_date: date) -> dict[str, Decimal]:
@@ -177,7 +210,25 @@ class EntryService:
             .where(CashEntry.created_at >= start_dt, CashEntry.created_at <= end_dt, _not_deleted)
             .order_by(CashEntry.created_at.asc(), CashEntry.id.asc())
         )
-        return list(result.scalars().all())
+        return result.scalars().all()
+
+    async def stream_entries_for_day(
+        self, session: AsyncSession, target_date: date
+    ) -> AsyncScalarResult[CashEntry]:
+        """Stream one local day's entries with a server-side cursor.
+
+        Unlike entries_for_day this never materializes the whole day in
+        memory; rows arrive in yield_per-sized batches.
+        """
+
+        start_dt, end_dt = _local_day_bounds(target_date)
+        result = await session.stream(
+            select(CashEntry)
+            .where(CashEntry.created_at >= start_dt, CashEntry.created_at <= end_dt, _not_deleted)
+            .order_by(CashEntry.created_at.asc(), CashEntry.id.asc())
+            .execution_options(yield_per=500)
+        )
+        return result.scalars()
 
     async def _net_by_currency(
         self,
@@ -7,12 +7,12 @@ from decimal import Decimal
 from typing import Optional
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import func, select
+from sqlalchemy import case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased
 
 from app.config import get_settings
-from app.database.models import Transaction
+from app.database.models import Currency, Transaction
 from app.profit.service import ProfitService
 from app.schemas.report import PeriodReport, ProfitReport
 
@@ -45,8 +45,11 @@ class ReportService:
         else:
             end_date = date(year, month + 1, 1) - timedelta(days=1)
 
-        start_dt = datetime.combine(start_date, time.min)
-        end_dt = datetime.combine(end_date, time.max)
+        # Aware bounds keep the created_at comparison sargable on Postgres;
+        # naive values force a per-row timezone assumption server-side.
+        tz = ZoneInfo(get_settings().timezone)
+        start_dt = datetime.combine(start_date, time.min, tzinfo=tz)
+        end_dt = datetime.combine(end_date, time.max, tzinfo=tz)
         return await self._period_report(session, "monthly", start_date, end_date, start_dt, end_dt)
 
     async def profit_report(
@@ -70,27 +73,29 @@ class ReportService:
     ) -> PeriodReport:
         """Common implementation for daily/monthly summaries."""
 
-        count_result = await session.execute(
-            select(func.count(Transaction.id)).where(
-                Transaction.created_at >= start_dt,
-                Transaction.created_at <= end_dt,
-            )
-        )
-        tx_count = int(count_result.scalar_one())
-
-        tx_result = await session.execute(
-            select(Transaction)
-            .options(joinedload(Transaction.from_currency), joinedload(Transaction.to_currency))
-            .where(Transaction.created_at >= start_dt, Transaction.created_at <= end_dt)
+        # Count and base-currency turnover fold into one aggregate query; the
+        # old version loaded every transaction (with both currency rows) just
+        # to sum two columns in Python.
+        from_currency = aliased(Currency)
+        to_currency = aliased(Currency)
+        turnover_case = case(
+            (from_currency.code == self.base_currency_code, Transaction.from_amount),
+            (to_currency.code == self.base_currency_code, Transaction.to_amount),
+            else_=0,
         )
-        transactions = list(tx_result.scalars().all())
-
-        turnover = Decimal("0")
-        for tx in transactions:
-            if tx.from_currency.code == self.base_currency_code:
-                turnover += Decimal(tx.from_amount)
-            elif tx.to_currency.code == self.base_currency_code:
-                turnover += Decimal(tx.to_amount)
+        row = (
+            await session.execute(
+                select(
+                    func.count(Transaction.id),
+                    func.coalesce(func.sum(turnover_case), 0),
+                )
+                .join(from_currency, Transaction.from_currency_id == from_currency.id)
+                .join(to_currency, Transaction.to_currency_id == to_currency.id)
+                .where(Transaction.created_at >= start_dt, Transaction.created_at <= end_dt)
+            )
+        ).one()
+        tx_count = int(row[0])
+        turnover = Decimal(row[1])
 
         profit = await self.profit_service.profit_report(session=session, start_at=start_dt, end_at=end_dt)
 
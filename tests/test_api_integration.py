@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 from datetime import date
+from decimal import Decimal
 
 import pytest
 
+from app.schemas.entry import EntryCreate
+from app.services.entry_service import EntryService
+
 
 @pytest.mark.asyncio
 async def test_post_entries_then_list_and_reports(api_client, allowed_headers: dict[str, str]) -> None:
@@ -77,3 +81,61 @@ async def test_ai_parse_then_confirm_create_entry(api_client, allowed_headers: d
 async def test_unauthorized_telegram_id_returns_403(api_client, denied_headers: dict[str, str]) -> None:
     response = await api_client.get("/api/v1/entries", headers=denied_headers)
     assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_report_etag_revalidation(api_client, allowed_headers: dict[str, str], session_factory) -> None:
+    first = await api_client.get("/api/v1/reports/currency-balances", headers=allowed_headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    cached = await api_client.get(
+        "/api/v1/reports/currency-balances",
+        headers={**allowed_headers, "If-None-Match": etag},
+    )
+    assert cached.status_code == 304
+
+    created = await api_client.post(
+        "/api/v1/entries",
+        headers=allowed_headers,
+        json={
+            "amount": "10",
+            "currency_code": "USD",
+            "flow_direction": "INFLOW",
+            "client_name": "Ali",
+            "note": None,
+        },
+    )
+    assert created.status_code == 200
+
+    refreshed = await api_client.get(
+        "/api/v1/reports/currency-balances",
+        headers={**allowed_headers, "If-None-Match": etag},
+    )
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+
+    # An in-place edit has no new MAX(id) and no soft delete; the probe must
+    # still move via updated_at so the old token cannot serve a stale 304.
+    etag_before_edit = refreshed.headers["etag"]
+    async with session_factory() as session:
+        updated = await EntryService().update_entry(
+            session,
+            created.json()["id"],
+            EntryCreate(
+                amount=Decimal("25"),
+                currency_code="USD",
+                flow_direction="OUTFLOW",
+                client_name="Ali",
+                note=None,
+            ),
+            user_id=1001,
+        )
+    assert updated is not None
+
+    edited = await api_client.get(
+        "/api/v1/reports/currency-balances",
+        headers={**allowed_headers, "If-None-Match": etag_before_edit},
+    )
+    assert edited.status_code == 200
+    assert edited.headers["etag"] != etag_before_edit
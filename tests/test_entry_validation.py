@@ -26,7 +26,7 @@ def test_entry_create_valid_payload() -> None:
     [
         {"amount": "0", "currency_code": "USD", "flow_direction": "INFLOW", "client_name": "Ali"},
         {"amount": "-1", "currency_code": "USD", "flow_direction": "INFLOW", "client_name": "Ali"},
-        {"amount": "10", "currency_code": "EUR", "flow_direction": "INFLOW", "client_name": "Ali"},
+        {"amount": "10", "currency_code": "GBP", "flow_direction": "INFLOW", "client_name": "Ali"},
         {"amount": "10", "currency_code": "USD", "flow_direction": "BUY", "client_name": "Ali"},
         {"amount": "10", "currency_code": "USD", "flow_direction": "INFLOW", "client_name": " "},
     ],
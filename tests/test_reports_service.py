@@ -57,7 +57,7 @@ async def test_report_aggregations_and_debt_formula(session_factory: async_sessi
     assert by_currency["UZS"] == Decimal("400")
     assert uzs_total == Decimal("400")
 
-    debt_index = {(client, currency): amount for client, currency, amount in debts}
+    debt_index = {(client, currency): amount for client, currency, amount, _ in debts}
     assert debt_index[("Ali", "USD")] == Decimal("-70")  # outflow - inflow
     assert debt_index[("Ali", "RUB")] == Decimal("10")
     assert debt_index[("Bob", "UZS")] == Decimal("-400")